@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# bunnypad_download.py - resumable, segmented update downloader
+"""Qt-free home of the update downloader, so it can be run against any local HTTP server.
+
+The BunnyPad updater wraps SegmentedDownload in its Downloader QThread.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_SEGMENTS = 4  # parallel Range requests, when the server supports them
+DOWNLOAD_MIN_SEGMENT = 4 * 1024 * 1024  # smaller files are fetched in one piece
+DOWNLOAD_RETRIES = 3  # per segment, each resuming where the last attempt stopped
+DOWNLOAD_TIMEOUT = 30
+PROGRESS_INTERVAL = 0.1  # seconds between progress callbacks (~10 per second)
+
+
+class DownloadError(Exception):
+    pass
+
+
+class SegmentedDownload:
+    """Downloads url to filename with resume, parallel segments and SHA-256 checking.
+
+    Data goes to filename + ".part" and the byte ranges already fetched to
+    filename + ".part.json", so an interrupted download continues where it left
+    off as long as the server still reports the same size and ETag. With Range
+    support the file is split into up to `segments` parts fetched in parallel.
+    The SHA-256 is computed while downloading, over the contiguous prefix that
+    has arrived, and compared with `sha256` at the end when one is given.
+    """
+
+    def __init__(self, url, filename, sha256=None, segments=DOWNLOAD_SEGMENTS,
+                 progress=None, cancelled=None, session=None):
+        self.url = url
+        self.filename = filename
+        self.part_path = filename + ".part"
+        self.state_path = filename + ".part.json"
+        self.sha256 = sha256.lower() if sha256 else None
+        self.segments = max(1, segments)
+        self.progress = progress or (lambda total, done: None)
+        self.cancelled = cancelled or (lambda: False)
+        self.session = session or requests.Session()
+        self.lock = threading.Lock()
+        self.ranges = []  # [start, end (exclusive), bytes done] per segment
+        self.total = 0
+        self.hasher = hashlib.sha256()
+        self.hashed = 0
+
+    def probe(self):
+        """(total size or 0, accepts ranges, validators, final URL) from a 1-byte ranged GET."""
+        with self.session.get(self.url, headers={"Range": "bytes=0-0"}, stream=True, timeout=DOWNLOAD_TIMEOUT) as resp:
+            resp.raise_for_status()
+            validators = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+            content_range = resp.headers.get("Content-Range", "")
+            if resp.status_code == 206 and "/" in content_range and not content_range.endswith("/*"):
+                return int(content_range.rsplit("/", 1)[1]), True, validators, resp.url
+            return int(resp.headers.get("Content-Length", 0)), False, validators, resp.url
+
+    def plan(self, total, ranged):
+        if not ranged or not total:
+            return [[0, total or None, 0]]
+        count = max(1, min(self.segments, total // DOWNLOAD_MIN_SEGMENT))
+        bounds = [total * i // count for i in range(count + 1)]
+        return [[bounds[i], bounds[i + 1], 0] for i in range(count)]
+
+    def load_state(self, total, validators):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (state.get("url") != self.url or state.get("total") != total
+                or state.get("validators") != validators or not os.path.exists(self.part_path)):
+            return None
+        return state.get("ranges")
+
+    def save_state(self, validators):
+        with self.lock:
+            state = {"url": self.url, "total": self.total, "validators": validators,
+                     "ranges": [list(r) for r in self.ranges]}
+        try:
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+        except OSError as e:
+            logger.warning("Could not save download state: %s", e)
+
+    def fetch_segment(self, index, url, ranged):
+        for attempt in range(DOWNLOAD_RETRIES + 1):
+            with self.lock:
+                start, end, done = self.ranges[index]
+            if end is not None and start + done >= end:
+                return
+            headers = {}
+            if ranged:
+                headers["Range"] = f"bytes={start + done}-{end - 1}"
+            try:
+                with self.session.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as resp:
+                    resp.raise_for_status()
+                    if ranged and resp.status_code != 206:
+                        raise DownloadError("Server ignored the Range request")
+                    with open(self.part_path, "r+b") as f:
+                        f.seek(start + done)
+                        for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            if self.cancelled():
+                                return
+                            f.write(chunk)
+                            f.flush()  # hash_prefix and the state file may count it from here on
+                            with self.lock:
+                                self.ranges[index][2] += len(chunk)
+                if end is None:
+                    with self.lock:
+                        self.ranges[index][1] = start + self.ranges[index][2]
+                    return
+            except (requests.RequestException, OSError) as e:
+                if not ranged or attempt == DOWNLOAD_RETRIES:
+                    raise
+                logger.warning("Segment %d failed (%s), retrying", index, e)
+                time.sleep(2 ** attempt)
+
+    def downloaded(self):
+        with self.lock:
+            return sum(r[2] for r in self.ranges)
+
+    def hash_prefix(self, f):
+        """Feed the bytes between self.hashed and the first gap into the hash."""
+        with self.lock:
+            prefix = 0
+            for start, end, done in self.ranges:
+                prefix = start + done
+                if end is None or start + done < end:
+                    break
+        f.seek(self.hashed)
+        while self.hashed < prefix:
+            block = f.read(min(DOWNLOAD_CHUNK_SIZE, prefix - self.hashed))
+            if not block:
+                break
+            self.hasher.update(block)
+            self.hashed += len(block)
+
+    def run(self):
+        """Download and verify; returns the final path, raises DownloadError on failure."""
+        self.total, ranged, validators, url = self.probe()
+        ranges = self.load_state(self.total, validators) if ranged else None
+        if ranges:
+            logger.info("Resuming download of %s", self.url)
+        self.ranges = ranges or self.plan(self.total, ranged)
+        if not ranges:
+            with open(self.part_path, "wb") as f:
+                if ranged:
+                    f.truncate(self.total)
+        if ranged:
+            self.save_state(validators)
+
+        last_saved = time.monotonic()
+        with open(self.part_path, "rb", buffering=0) as hash_file, \
+                ThreadPoolExecutor(max_workers=len(self.ranges)) as pool:
+            futures = [pool.submit(self.fetch_segment, i, url, ranged) for i in range(len(self.ranges))]
+            while not all(future.done() for future in futures):
+                time.sleep(PROGRESS_INTERVAL)
+                self.hash_prefix(hash_file)
+                self.progress(self.total, self.downloaded())
+                if ranged and time.monotonic() - last_saved > 1:
+                    self.save_state(validators)
+                    last_saved = time.monotonic()
+            if ranged:
+                self.save_state(validators)
+            for future in futures:
+                future.result()  # re-raises a segment's error
+            if self.cancelled():
+                raise DownloadError("Download cancelled")
+            self.hash_prefix(hash_file)
+        self.total = self.total or self.downloaded()
+        self.progress(self.total, self.downloaded())
+
+        if self.downloaded() != self.total:
+            raise DownloadError(f"Incomplete download: {self.downloaded()} of {self.total} bytes")
+        digest = self.hasher.hexdigest()
+        if self.sha256 and digest != self.sha256:
+            self.remove_partial()
+            raise DownloadError(f"SHA-256 mismatch: expected {self.sha256}, got {digest}")
+        os.replace(self.part_path, self.filename)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        logger.info("Downloaded %s (%d bytes, sha256 %s)", self.filename, self.total, digest)
+        return self.filename
+
+    def remove_partial(self):
+        for path in (self.part_path, self.state_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,135 @@
+# test_bunnypad_download.py - SegmentedDownload against a local HTTP server
+"""Run with `python -m pytest prettyfonts/v10.1` or `python -m unittest` from this directory."""
+
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+HAVE_REQUESTS = importlib.util.find_spec("requests") is not None
+if HAVE_REQUESTS:
+    import bunnypad_download
+    from bunnypad_download import DownloadError, SegmentedDownload
+
+DATA = bytes(range(256)) * 64  # 16 KiB
+SEGMENT = 4 * 1024  # DOWNLOAD_MIN_SEGMENT for the tests, so DATA splits into four
+ETAG = '"bunnypad-test"'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves DATA, honouring Range unless the server's `ranged` is False.
+
+    With the server's `pause` set, the first KiB of the body is sent on its own
+    and the rest after that many seconds.
+    """
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get("Range"))
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+        if match and self.server.ranged:
+            start = int(match.group(1))
+            end = int(match.group(2)) + 1 if match.group(2) else len(DATA)
+            body = DATA[start:end]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end - 1}/{len(DATA)}")
+        else:
+            body = DATA
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        if self.server.pause:
+            self.wfile.write(body[:1024])
+            self.wfile.flush()
+            time.sleep(self.server.pause)
+            body = body[1024:]
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipUnless(HAVE_REQUESTS, "requests is not installed")
+class SegmentedDownloadTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.ranged = True
+        self.server.requests = []
+        self.server.pause = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/update.bin"
+        self.dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dir, "update.bin")
+        patcher = mock.patch.object(bunnypad_download, "DOWNLOAD_MIN_SEGMENT", SEGMENT)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.dir)
+
+    def download(self, sha256=hashlib.sha256(DATA).hexdigest()):
+        return SegmentedDownload(self.url, self.filename, sha256).run()
+
+    def read_result(self):
+        with open(self.filename, "rb") as f:
+            return f.read()
+
+    def test_ranged_download_is_split_into_segments(self):
+        self.assertEqual(self.download(), self.filename)
+        self.assertEqual(self.read_result(), DATA)
+        fetched = sorted(self.server.requests[1:], key=lambda r: int(r[6:].split("-")[0]))
+        self.assertEqual(fetched, ["bytes=0-4095", "bytes=4096-8191", "bytes=8192-12287", "bytes=12288-16383"])
+        self.assertFalse(os.path.exists(self.filename + ".part"))
+        self.assertFalse(os.path.exists(self.filename + ".part.json"))
+
+    def test_server_without_range_support(self):
+        self.server.ranged = False
+        self.download()
+        self.assertEqual(self.read_result(), DATA)
+        self.assertEqual(self.server.requests, ["bytes=0-0", None])
+
+    def test_resume_from_saved_state(self):
+        # the first 1000 bytes of each segment arrived before the interruption
+        ranges = [[start, start + SEGMENT, 1000] for start in range(0, len(DATA), SEGMENT)]
+        with open(self.filename + ".part", "wb") as f:
+            f.truncate(len(DATA))
+            for start, end, done in ranges:
+                f.seek(start)
+                f.write(DATA[start:start + done])
+        with open(self.filename + ".part.json", "w", encoding="utf-8") as f:
+            json.dump({"url": self.url, "total": len(DATA), "ranges": ranges,
+                       "validators": {"etag": ETAG, "last_modified": None}}, f)
+        self.download()
+        self.assertEqual(self.read_result(), DATA)
+        self.assertEqual(sorted(self.server.requests[1:], key=lambda r: int(r[6:].split("-")[0])),
+                         [f"bytes={start + 1000}-{end - 1}" for start, end, done in ranges])
+
+    def test_hash_only_reads_written_bytes(self):
+        # one ranged segment into the pre-sized .part file; the progress loop
+        # hashes the first KiB while the rest is still on its way
+        self.server.pause = 5 * bunnypad_download.PROGRESS_INTERVAL
+        with mock.patch.object(bunnypad_download, "DOWNLOAD_CHUNK_SIZE", 1024), \
+                mock.patch.object(bunnypad_download, "DOWNLOAD_MIN_SEGMENT", len(DATA)):
+            self.download()
+        self.assertEqual(self.read_result(), DATA)
+
+    def test_sha256_mismatch_removes_partial_files(self):
+        with self.assertRaisesRegex(DownloadError, "SHA-256 mismatch"):
+            self.download(sha256="0" * 64)
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertFalse(os.path.exists(self.filename + ".part"))
+        self.assertFalse(os.path.exists(self.filename + ".part.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -83,6 +83,7 @@ logging.basicConfig(
     ]
 )
 logger = logging.getLogger(__name__)
+from bunnypad_download import DOWNLOAD_SEGMENTS, SegmentedDownload
 def save_as_pdf(text, file_path):
     pdf = FPDF()
     pdf.add_page()
@@ -579,10 +580,13 @@ class UpdateChecker(QThread):
                     assets = release.get('assets', [])
                     if assets:
                         asset = assets[0]
+                        # GitHub publishes the asset's digest as "sha256:<hex>"
+                        digest = asset.get('digest') or ""
                         return {
                             'version': release.get('tag_name'),
                             'url': asset.get('browser_download_url'),
                             'name': asset.get('name'),
+                            'sha256': digest[7:] if digest.startswith("sha256:") else None,
                             'prerelease': release.get('prerelease', False),
                             'tag_name': release.get('tag_name')
                         }
@@ -601,35 +605,27 @@ class UpdateChecker(QThread):
 class Downloader(QThread):
     progress = pyqtSignal(int, int, int)  # total size, downloaded size, percentage
     download_complete = pyqtSignal(str)
+    download_failed = pyqtSignal(str)
 
-    def __init__(self, url, filename):
+    def __init__(self, url, filename, sha256=None, segments=DOWNLOAD_SEGMENTS):
         super().__init__()
         self.url = url
         self.filename = filename
+        self.sha256 = sha256
+        self.segments = segments
+
+    def report(self, total_size, downloaded_size):
+        percentage = int(100 * downloaded_size / total_size) if total_size else 0
+        self.progress.emit(total_size, downloaded_size, percentage)
 
     def run(self):
+        download = SegmentedDownload(self.url, self.filename, self.sha256, self.segments,
+                                     progress=self.report, cancelled=self.isInterruptionRequested)
         try:
-            response = requests.get(self.url, stream=True)
+            self.download_complete.emit(download.run())
         except Exception as e:
             logger.error("Download error: %s", e)
-            return
-
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded_size = 0
-
-        try:
-            with open(self.filename, 'wb') as file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        file.write(chunk)
-                        downloaded_size += len(chunk)
-                        percentage = int(100 * downloaded_size / total_size) if total_size else 0
-                        self.progress.emit(total_size, downloaded_size, percentage)
-        except Exception as e:
-            logger.error("Error writing file: %s", e)
-            return
-
-        self.download_complete.emit(self.filename)
+            self.download_failed.emit(str(e))
 
 
 class UpdateModule(QWidget):
@@ -692,9 +688,10 @@ class UpdateModule(QWidget):
         download_path = os.path.join(download_dir, release_info['name'])
 
         self.label.setText(self.tr("Downloading update..."))
-        self.downloader = Downloader(release_info['url'], download_path)
+        self.downloader = Downloader(release_info['url'], download_path, release_info.get('sha256'))
         self.downloader.progress.connect(self.update_progress)
         self.downloader.download_complete.connect(self.on_download_complete)
+        self.downloader.download_failed.connect(self.on_download_failed)
         self.downloader.start()
 
     @pyqtSlot(int, int, int)
@@ -721,6 +718,11 @@ class UpdateModule(QWidget):
             self.run_update(filename)
         self.progress_bar.reset()
 
+    @pyqtSlot(str)
+    def on_download_failed(self, error):
+        # Partial data is kept, so trying again resumes the download
+        self.label.setText(self.tr("Download failed: {error}").format(error=error))
+
     def get_download_directory(self, release_name, tag_name):
         """
         Returns a directory where the update file can be downloaded and installed.
@@ -0,0 +1,1063 @@
+#!/usr/bin/env python3
+# bunnypad_crypto.py - RCCMITOWOATAS crypto engine and the bunnypad-crypto CLI
+"""Qt-free home of the German-words/Caesar/hex/base64/AES pipeline.
+
+The BunnyPad GUI imports CryptoEngine from here, and running this file directly
+gives the `bunnypad-crypto` batch tool, which never imports PyQt:
+
+    python bunnypad_crypto.py encrypt -k KEY notes/ -o encrypted/
+    python bunnypad_crypto.py decrypt -k KEY encrypted/ -o plain/ --jobs 8
+"""
+
+import argparse
+import base64
+import codecs
+import contextlib
+import getpass
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+# Optional: vectorized word-boundary search for the German word inserter
+try:
+    import numpy
+except Exception:
+    numpy = None
+
+try:
+    from cryptography.hazmat.primitives import padding
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.exceptions import InvalidTag
+except ImportError:
+    print("Cryptography package not found. Install with: pip install cryptography")
+    sys.exit(1)
+
+# ---------------- Crypto Engine ----------------
+CRYPTO_CHUNK_SIZE = 64 * 1024  # characters per streamed pipeline chunk
+GERMAN_MARKER = "§"
+GERMAN_WORDS = [
+    "dost", "orden", "meer", "baum", "vogel", "fluss", "himmel", "freude",
+    "licht", "schloss", "apfel", "garten", "wasser", "freund", "blume", "straße",
+    "morgen", "nacht", "sonne", "mond", "stern", "eule", "hausaufgabe", "katze",
+    "wolke", "freundlich", "schnell", "langsam", "laut", "ruhig", "schön",
+    "schlecht", "freundschaft", "abenteuer", "trinken", "laufen", "springen",
+    "tanzen", "schreiben", "musizieren", "singen", "fühlen", "träumen", "denken"
+]
+
+def iter_text_chunks(text, size=CRYPTO_CHUNK_SIZE):
+    """Yield `text` in slices of at most `size` characters."""
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+class StreamingBase64Encoder:
+    """Incremental base64: holds back the 0-2 bytes that don't fill a 3-byte group."""
+
+    def __init__(self):
+        self._pending = b""
+
+    def update(self, data: bytes) -> bytes:
+        data = self._pending + data
+        cut = len(data) - len(data) % 3
+        self._pending = data[cut:]
+        return base64.b64encode(data[:cut])
+
+    def finalize(self) -> bytes:
+        out, self._pending = base64.b64encode(self._pending), b""
+        return out
+
+class StreamingBase64Decoder:
+    """Incremental base64 decode; like b64decode, characters outside the alphabet are dropped."""
+
+    ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+    NOT_ALPHABET = bytes(sorted(set(range(256)) - set(ALPHABET)))
+
+    def __init__(self):
+        self._pending = b""
+
+    def update(self, data: bytes) -> bytes:
+        data = self._pending + data.translate(None, self.NOT_ALPHABET)
+        cut = len(data) - len(data) % 4
+        self._pending = data[cut:]
+        return base64.b64decode(data[:cut])
+
+    def finalize(self) -> bytes:
+        out, self._pending = base64.b64decode(self._pending), b""
+        return out
+
+class StreamingHexDecoder:
+    """Incremental bytes.fromhex that carries an odd trailing digit into the next chunk."""
+
+    def __init__(self):
+        self._pending = ""
+
+    def update(self, text: str) -> bytes:
+        text = self._pending + text
+        cut = len(text) - len(text) % 2
+        self._pending = text[cut:]
+        return bytes.fromhex(text[:cut])
+
+    def finalize(self) -> bytes:
+        if self._pending:
+            raise ValueError("non-hexadecimal number found in fromhex() arg")
+        return b""
+
+class KeyCache:
+    """Small thread-safe LRU of prepared key material.
+
+    Only immutable values are stored (cipher contexts are not thread-safe), so the
+    same entry can be shared by the GUI thread, workers and batch calls.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key, build):
+        with self._lock:
+            if cache_key in self._items:
+                self._items.move_to_end(cache_key)
+                return self._items[cache_key]
+        value = build()
+        with self._lock:
+            self._items[cache_key] = value
+            self._items.move_to_end(cache_key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+AES_KEY_CACHE = KeyCache(32)
+DERIVED_KEY_CACHE = KeyCache(8)
+_BACKEND = default_backend()
+_PKCS7 = padding.PKCS7(128)
+
+def aes_key_material(key):
+    """algorithms.AES for a text key, validated and encoded once per key.
+
+    Cached under a digest of the key, like derive_document_key, so the key
+    string itself is not kept around as a dictionary key.
+    """
+    secret = key.encode()
+    return AES_KEY_CACHE.get(hashlib.sha256(secret).digest(), lambda: algorithms.AES(secret))
+
+class AESStreamEncryptor:
+    """Incremental form of CryptoEngine.aes_encrypt: base64(iv + AES-CBC(PKCS7(data)))."""
+
+    def __init__(self, key):
+        iv = os.urandom(16)
+        cipher = Cipher(aes_key_material(key), modes.CBC(iv), backend=_BACKEND)
+        self._encryptor = cipher.encryptor()
+        self._padder = _PKCS7.padder()
+        self._b64 = StreamingBase64Encoder()
+        self._header = iv
+
+    def update(self, data: bytes) -> str:
+        out = self._header + self._encryptor.update(self._padder.update(data))
+        self._header = b""
+        return self._b64.update(out).decode("ascii")
+
+    def finalize(self) -> str:
+        out = self._header + self._encryptor.update(self._padder.finalize()) + self._encryptor.finalize()
+        self._header = b""
+        return (self._b64.update(out) + self._b64.finalize()).decode("ascii")
+
+class AESStreamDecryptor:
+    """Incremental form of CryptoEngine.aes_decrypt; the IV is taken from the first 16 bytes."""
+
+    def __init__(self, key):
+        self._key = aes_key_material(key)
+        self._b64 = StreamingBase64Decoder()
+        self._iv = b""
+        self._decryptor = None
+        self._unpadder = _PKCS7.unpadder()
+
+    def _feed(self, data: bytes) -> bytes:
+        if self._decryptor is None:
+            self._iv += data
+            if len(self._iv) < 16:
+                return b""
+            self._iv, data = self._iv[:16], self._iv[16:]
+            cipher = Cipher(self._key, modes.CBC(self._iv), backend=_BACKEND)
+            self._decryptor = cipher.decryptor()
+        return self._unpadder.update(self._decryptor.update(data))
+
+    def update(self, text: str) -> bytes:
+        return self._feed(self._b64.update(text.encode("ascii")))
+
+    def finalize(self) -> bytes:
+        out = self._feed(self._b64.finalize())
+        if self._decryptor is None:
+            raise ValueError("Ciphertext is shorter than the AES IV")
+        return out + self._unpadder.update(self._decryptor.finalize()) + self._unpadder.finalize()
+
+class StreamingWordRewriter:
+    """Base for the German word filters: rewrites text chunk by chunk without touching whitespace.
+
+    The tail that might still change once the next chunk arrives (an unfinished
+    word, as decided by _boundary()) is held back until then or until finish().
+    """
+
+    def __init__(self):
+        self._pending = ""
+
+    @staticmethod
+    def last_word_start(text: str) -> int:
+        """Offset of the trailing word, or len(text) if it ends in whitespace."""
+        if not text or text[-1].isspace():
+            return len(text)
+        return len(text) - len(text.rsplit(None, 1)[-1])
+
+    def _boundary(self, text: str) -> int:
+        return len(text)
+
+    def rewrite(self, text: str) -> str:
+        return text
+
+    def feed(self, chunk: str) -> str:
+        text = self._pending + chunk
+        cut = self._boundary(text)
+        self._pending = text[cut:]
+        return self.rewrite(text[:cut])
+
+    def finish(self) -> str:
+        text, self._pending = self._pending, ""
+        return self.rewrite(text)
+
+class GermanWordInserter(StreamingWordRewriter):
+    """Stateful CryptoEngine.insert_german_words for chunked input.
+
+    Adds " <marker><word>" after every `interval`-th word; the original whitespace
+    runs are kept as they are.
+    """
+
+    WORD = re.compile(r"\S+")
+    # str.isspace() up to U+3000, the last space character; everything above is
+    # clamped to the extra False entry at U+3001
+    SPACE_TABLE = numpy.array([chr(cp).isspace() for cp in range(0x3002)]) if numpy is not None else None
+
+    def __init__(self, marker, words, interval):
+        super().__init__()
+        self.tags = [" " + marker + word for word in words]
+        self.interval = interval
+        self.count = 0
+        self.inserted = 0
+
+    def _boundary(self, text: str) -> int:
+        return self.last_word_start(text)
+
+    def word_ends(self, text: str):
+        """Offsets just past each word, as a list or a NumPy array."""
+        if numpy is None:
+            return [m.end() for m in self.WORD.finditer(text)]
+        cps = numpy.frombuffer(text.encode("utf-32-le"), dtype=numpy.uint32)
+        space = self.SPACE_TABLE[numpy.minimum(cps, 0x3001)]
+        return numpy.flatnonzero(~space & numpy.append(space[1:], True)) + 1
+
+    def rewrite(self, text: str) -> str:
+        if not self.interval or self.interval < 1 or not text:
+            return text
+        ends = self.word_ends(text)
+        # Index of the first word in this batch that completes an interval
+        first = (-self.count - 1) % self.interval
+        self.count += len(ends)
+        picks = ends[first::self.interval]
+        if len(picks) == 0:
+            return text
+        if numpy is not None:
+            picks = picks.tolist()
+        pieces = [text[a:b] for a, b in zip([0] + picks, picks)]
+        shift = self.inserted % len(self.tags)
+        cycle = self.tags[shift:] + self.tags[:shift]
+        self.inserted += len(pieces)
+        out = [None] * (2 * len(pieces))
+        out[0::2] = pieces
+        out[1::2] = (cycle * (len(pieces) // len(cycle) + 1))[:len(pieces)]
+        out.append(text[picks[-1]:])
+        return "".join(out)
+
+class GermanWordRemover(StreamingWordRewriter):
+    """Stateful CryptoEngine.remove_german_words for chunked input.
+
+    Drops every word starting with the marker together with the single space the
+    inserter put in front of it, so insert followed by remove is lossless.
+    """
+
+    def __init__(self, marker):
+        super().__init__()
+        self.marker = marker
+        self.spaced = re.compile(" " + re.escape(marker) + r"\S*")
+        self.bare = re.compile(r"(?<!\S)" + re.escape(marker) + r"\S*")
+
+    def _boundary(self, text: str) -> int:
+        # Hold back from the last whitespace on: it may be the space before a
+        # marker word that only arrives with the next chunk.
+        return max(0, self.last_word_start(text) - 1)
+
+    def rewrite(self, text: str) -> str:
+        if self.marker not in text:
+            return text
+        text = self.spaced.sub("", text)
+        # Marker words the inserter didn't write (start of line, after a tab...)
+        if self.marker in text:
+            text = self.bare.sub("", text)
+        return text
+
+class CaesarTable(dict):
+    """str.translate table for one Caesar shift.
+
+    ASCII is filled in up front. Any other code point is mapped on first sight by
+    __missing__ and memoized, so non-ASCII letters (which isalpha() lets through)
+    keep their original mapping without building a table over all of Unicode.
+    """
+
+    def __init__(self, shift):
+        super().__init__()
+        self.shift = shift % 26
+        for cp in range(128):
+            self.__missing__(cp)
+
+    def __missing__(self, cp):
+        ch = chr(cp)
+        if ch.isalpha():
+            offset = 65 if ch.isupper() else 97
+            mapped = (cp - offset + self.shift) % 26 + offset
+        else:
+            mapped = cp
+        self[cp] = mapped
+        return mapped
+
+class StageLog:
+    """Per-stage pipeline output for the debug view.
+
+    With a `limit`, only the first `limit` characters of each stage are kept, while
+    `sizes` still counts the full length, so verbose runs on big inputs stay small.
+    """
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.parts = {}
+        self.kept = {}
+        self.sizes = {}
+
+    def add(self, name, value):
+        self.sizes[name] = self.sizes.get(name, 0) + len(value)
+        parts = self.parts.setdefault(name, [])
+        kept = self.kept.get(name, 0)
+        if self.limit is not None:
+            value = value[:max(0, self.limit - kept)]
+        if value:
+            parts.append(value)
+            self.kept[name] = kept + len(value)
+
+    def text(self, name):
+        return "".join(self.parts.get(name, ()))
+
+    def truncated(self, name):
+        return self.kept.get(name, 0) < self.sizes.get(name, 0)
+
+    def as_dict(self):
+        return {name: self.text(name) for name in self.parts}
+
+class CryptoEngine:
+    CAESAR_TABLES = [CaesarTable(shift) for shift in range(26)]
+
+    def __init__(self):
+        self.german_marker = GERMAN_MARKER
+        self.german_words = GERMAN_WORDS.copy()
+
+    # ---- Caesar ----
+    @staticmethod
+    def caesar_cipher(text, shift):
+        return text.translate(CryptoEngine.CAESAR_TABLES[shift % 26])
+
+    @staticmethod
+    def caesar_decipher(text, shift):
+        return CryptoEngine.caesar_cipher(text, -shift)
+
+    # ---- Hex/Base64 ----
+    @staticmethod
+    def hex_encode(text):
+        return text.encode("utf-8").hex()
+
+    @staticmethod
+    def hex_decode(text):
+        return bytes.fromhex(text).decode("utf-8")
+
+    @staticmethod
+    def base64_encode(text):
+        return base64.b64encode(text.encode("utf-8")).decode("utf-8")
+
+    @staticmethod
+    def base64_decode(text):
+        return base64.b64decode(text).decode("utf-8")
+
+    # ---- AES ----
+    @staticmethod
+    def valid_aes_key(key):
+        return len(key) in (16, 24, 32)
+
+    @staticmethod
+    def aes_encrypt(plaintext, key):
+        if not CryptoEngine.valid_aes_key(key):
+            raise ValueError("AES key must be 16, 24, or 32 characters long")
+        iv = os.urandom(16)
+        cipher = Cipher(aes_key_material(key), modes.CBC(iv), backend=_BACKEND)
+        padder = _PKCS7.padder()
+        padded = padder.update(plaintext.encode()) + padder.finalize()
+        encryptor = cipher.encryptor()
+        enc = encryptor.update(padded) + encryptor.finalize()
+        return base64.b64encode(iv + enc).decode("utf-8")
+
+    @staticmethod
+    def aes_decrypt(ciphertext, key):
+        if not CryptoEngine.valid_aes_key(key):
+            raise ValueError("AES key must be 16, 24, or 32 characters long")
+        raw = base64.b64decode(ciphertext)
+        iv, ct = raw[:16], raw[16:]
+        cipher = Cipher(aes_key_material(key), modes.CBC(iv), backend=_BACKEND)
+        decryptor = cipher.decryptor()
+        padded = decryptor.update(ct) + decryptor.finalize()
+        unpadder = _PKCS7.unpadder()
+        return (unpadder.update(padded) + unpadder.finalize()).decode()
+
+    @staticmethod
+    def encrypt_many(texts, key):
+        """aes_encrypt for a batch of texts under one key; the key is prepared once."""
+        if not CryptoEngine.valid_aes_key(key):
+            raise ValueError("AES key must be 16, 24, or 32 characters long")
+        aes = aes_key_material(key)
+        out = []
+        for text in texts:
+            padder = _PKCS7.padder()
+            data = padder.update(text.encode()) + padder.finalize()
+            iv = os.urandom(16)
+            encryptor = Cipher(aes, modes.CBC(iv), backend=_BACKEND).encryptor()
+            out.append(base64.b64encode(iv + encryptor.update(data) + encryptor.finalize()).decode("utf-8"))
+        return out
+
+    @staticmethod
+    def decrypt_many(ciphertexts, key):
+        """aes_decrypt for a batch under one key; the key is prepared once."""
+        if not CryptoEngine.valid_aes_key(key):
+            raise ValueError("AES key must be 16, 24, or 32 characters long")
+        aes = aes_key_material(key)
+        out = []
+        for ciphertext in ciphertexts:
+            raw = base64.b64decode(ciphertext)
+            if len(raw) < 32 or len(raw) % 16:
+                raise ValueError("Invalid AES ciphertext length")
+            decryptor = Cipher(aes, modes.CBC(raw[:16]), backend=_BACKEND).decryptor()
+            padded = decryptor.update(raw[16:]) + decryptor.finalize()
+            unpadder = _PKCS7.unpadder()
+            out.append((unpadder.update(padded) + unpadder.finalize()).decode())
+        return out
+
+    # ---- German words insertion ----
+    def insert_german_words(self, text, interval):
+        inserter = GermanWordInserter(self.german_marker, self.german_words, interval)
+        return inserter.feed(text) + inserter.finish()
+
+    def remove_german_words(self, text):
+        remover = GermanWordRemover(self.german_marker)
+        return remover.feed(text) + remover.finish()
+
+    # ---- Pipelines ----
+    def encrypt_stream(self, chunks, shift, key, interval, stages=None):
+        """Yield ciphertext for an iterable of plaintext chunks, one bounded chunk at a time.
+
+        Output is identical to encrypt_pipeline. If `stages` is a StageLog, every
+        stage's output is recorded in it for the debug view.
+        """
+        if not self.valid_aes_key(key):
+            raise ValueError("AES key must be 16, 24, or 32 characters long")
+        inserter = GermanWordInserter(self.german_marker, self.german_words, interval)
+        b64 = StreamingBase64Encoder()
+        aes = AESStreamEncryptor(key)
+
+        def record(name, value):
+            if stages is not None:
+                stages.add(name, value)
+            return value
+
+        def run(piece, final):
+            step1 = record('Inserted German Words', piece)
+            step2 = record('Caesar Cipher', self.caesar_cipher(step1, shift))
+            step3 = record('Hex Encoded', self.hex_encode(step2))
+            step4 = b64.update(step3.encode("utf-8")) + (b64.finalize() if final else b"")
+            record('Base64 Encoded', step4.decode("ascii"))
+            return record('AES Encrypted', aes.update(step4) + (aes.finalize() if final else ""))
+
+        for chunk in chunks:
+            out = run(inserter.feed(chunk), False)
+            if out:
+                yield out
+        out = run(inserter.finish(), True)
+        if out:
+            yield out
+
+    def decrypt_stream(self, chunks, shift, key, interval, stages=None):
+        """Yield plaintext for an iterable of ciphertext chunks; the inverse of encrypt_stream."""
+        if not self.valid_aes_key(key):
+            raise ValueError("AES key must be 16, 24, or 32 characters long")
+        aes = AESStreamDecryptor(key)
+        aes_text = codecs.getincrementaldecoder("utf-8")()
+        b64 = StreamingBase64Decoder()
+        b64_text = codecs.getincrementaldecoder("utf-8")()
+        hex_decoder = StreamingHexDecoder()
+        hex_text = codecs.getincrementaldecoder("utf-8")()
+        remover = GermanWordRemover(self.german_marker)
+
+        def record(name, value):
+            if stages is not None:
+                stages.add(name, value)
+            return value
+
+        def run(piece, final):
+            raw = aes.update(piece) + (aes.finalize() if final else b"")
+            step1 = record('AES Decrypted', aes_text.decode(raw, final))
+            raw = b64.update(step1.encode("utf-8")) + (b64.finalize() if final else b"")
+            step2 = record('Base64 Decoded', b64_text.decode(raw, final))
+            raw = hex_decoder.update(step2) + (hex_decoder.finalize() if final else b"")
+            step3 = record('Hex Decoded', hex_text.decode(raw, final))
+            step4 = record('Caesar Deciphered', self.caesar_decipher(step3, shift))
+            return record('Cleaned Text', remover.feed(step4) + (remover.finish() if final else ""))
+
+        for chunk in chunks:
+            out = run(chunk, False)
+            if out:
+                yield out
+        out = run("", True)
+        if out:
+            yield out
+
+    def encrypt_pipeline(self, text, shift, key, interval, debug=True):
+        stages = StageLog() if debug else None
+        encrypted = "".join(self.encrypt_stream(iter_text_chunks(text), shift, key, interval, stages))
+        debug_steps = stages.as_dict() if debug else {}
+        return encrypted, debug_steps
+
+    def decrypt_pipeline(self, text, shift, key, interval, debug=True):
+        try:
+            stages = StageLog() if debug else None
+            clean = "".join(self.decrypt_stream(iter_text_chunks(text), shift, key, interval, stages))
+            debug_steps = stages.as_dict() if debug else {}
+            return clean, debug_steps
+        except Exception as e:
+            return f"[!] Decryption error: {e}", {}
+
+# --------------------
+# Editor transforms
+# --------------------
+# Edit > Transform feeds the document through one of these a chunk at a time:
+# feed(str) -> str for each chunk, then finish() -> str for whatever was held back.
+
+class ChunkTransform:
+    """Apply a str -> str function chunk by chunk.
+
+    With `line_buffered`, text after the last newline waits for the next chunk, so
+    context-sensitive functions (normalization, final-sigma lowercasing) always see
+    whole lines; a line longer than LINE_LIMIT is let through anyway.
+    """
+
+    LINE_LIMIT = 1 << 20
+
+    def __init__(self, func, line_buffered=False):
+        self.func = func
+        self.line_buffered = line_buffered
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        if not self.line_buffered:
+            return self.func(chunk)
+        text = self._pending + chunk
+        cut = text.rfind("\n") + 1
+        if not cut and len(text) > self.LINE_LIMIT:
+            cut = len(text)
+        self._pending = text[cut:]
+        return self.func(text[:cut]) if cut else ""
+
+    def finish(self) -> str:
+        out, self._pending = self.func(self._pending) if self._pending else "", ""
+        return out
+
+class Base64EncodeTransform:
+    """UTF-8 text -> base64, as one unwrapped line."""
+
+    def __init__(self):
+        self._encoder = StreamingBase64Encoder()
+
+    def feed(self, chunk: str) -> str:
+        return self._encoder.update(chunk.encode("utf-8")).decode("ascii")
+
+    def finish(self) -> str:
+        return self._encoder.finalize().decode("ascii")
+
+class DecodeTransform:
+    """hex/base64 text -> UTF-8 text; whitespace in the input (line wrapping) is ignored."""
+
+    def __init__(self, decoder, text_input=False):
+        self._decoder = decoder
+        self._text_input = text_input
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+
+    def feed(self, chunk: str) -> str:
+        chunk = "".join(chunk.split())
+        data = chunk if self._text_input else chunk.encode("ascii", "ignore")
+        return self._utf8.decode(self._decoder.update(data))
+
+    def finish(self) -> str:
+        return self._utf8.decode(self._decoder.finalize(), True)
+
+TEXT_TRANSFORMS = {
+    "hex_encode": lambda shift: ChunkTransform(CryptoEngine.hex_encode),
+    "hex_decode": lambda shift: DecodeTransform(StreamingHexDecoder(), text_input=True),
+    "base64_encode": lambda shift: Base64EncodeTransform(),
+    "base64_decode": lambda shift: DecodeTransform(StreamingBase64Decoder()),
+    "caesar": lambda shift: ChunkTransform(lambda t: CryptoEngine.caesar_cipher(t, shift)),
+    "upper": lambda shift: ChunkTransform(str.upper, line_buffered=True),
+    "lower": lambda shift: ChunkTransform(str.lower, line_buffered=True),
+    "nfc": lambda shift: ChunkTransform(lambda t: unicodedata.normalize("NFC", t), line_buffered=True),
+    "nfd": lambda shift: ChunkTransform(lambda t: unicodedata.normalize("NFD", t), line_buffered=True),
+}
+
+def text_transform(name, shift=0):
+    """A fresh feed()/finish() transform from TEXT_TRANSFORMS."""
+    return TEXT_TRANSFORMS[name](shift)
+
+@contextlib.contextmanager
+def atomic_open(path, mode="wb", **kwargs):
+    """Open a temp file next to `path` and move it over `path` only if the block succeeds."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".bptmp-", dir=directory)
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+# --------------------
+# RCCM containers
+# --------------------
+# v2 layout (little-endian):
+#   header   "RCCM", version u8, flags u8, field count u16
+#   field    name length u8, type u8, value length u32, name, value   (repeated)
+#   payload  length u64, bytes
+RCCM_MAGIC = b"RCCM"
+RCCM_VERSION = 2
+RCCM_FLAG_ZLIB = 0x01  # payload is zlib-compressed
+RCCM_FLAG_RAW = 0x02   # payload is the base64-decoded ciphertext, not its text form
+RCCM_FIELD_INT = 0
+RCCM_FIELD_STR = 1
+_RCCM_HEADER = struct.Struct("<4sBBH")
+_RCCM_FIELD = struct.Struct("<BBI")
+_RCCM_PAYLOAD = struct.Struct("<Q")
+
+class RCCMFile:
+    """Read-only, mmap-backed view of an RCCM v2 file.
+
+    Only the header and fields are parsed on open; the payload is decoded on demand,
+    in bounded slices via iter_encrypted().
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("RCCM file is empty")
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self):
+        m = self._map
+        if len(m) < _RCCM_HEADER.size:
+            raise ValueError("RCCM header is truncated")
+        magic, version, self.flags, count = _RCCM_HEADER.unpack_from(m, 0)
+        if magic != RCCM_MAGIC:
+            raise ValueError("Not an RCCM v2 file")
+        if version != RCCM_VERSION:
+            raise ValueError(f"Unsupported RCCM version {version}")
+        pos = _RCCM_HEADER.size
+        self.fields = {}
+        for _ in range(count):
+            name_len, kind, size = _RCCM_FIELD.unpack_from(m, pos)
+            pos += _RCCM_FIELD.size
+            name = m[pos:pos + name_len].decode("ascii")
+            pos += name_len
+            raw = m[pos:pos + size]
+            pos += size
+            if kind == RCCM_FIELD_INT:
+                self.fields[name] = int.from_bytes(raw, "little", signed=True)
+            else:
+                self.fields[name] = raw.decode("utf-8")
+        (length,) = _RCCM_PAYLOAD.unpack_from(m, pos)
+        self._start = pos + _RCCM_PAYLOAD.size
+        self._end = self._start + length
+        if self._end > len(m):
+            raise ValueError("RCCM payload is truncated")
+
+    def iter_encrypted(self, size=CRYPTO_CHUNK_SIZE):
+        """Yield the stored ciphertext as text, reading at most `size` payload bytes at a time."""
+        inflate = zlib.decompressobj() if self.flags & RCCM_FLAG_ZLIB else None
+        b64 = StreamingBase64Encoder() if self.flags & RCCM_FLAG_RAW else None
+        text = codecs.getincrementaldecoder("utf-8")()
+        for start in range(self._start, self._end, size):
+            data = self._map[start:min(start + size, self._end)]
+            if inflate is not None:
+                data = inflate.decompress(data)
+            out = b64.update(data).decode("ascii") if b64 is not None else text.decode(data)
+            if out:
+                yield out
+        tail = inflate.flush() if inflate is not None else b""
+        out = (b64.update(tail) + b64.finalize()).decode("ascii") if b64 is not None else text.decode(tail, True)
+        if out:
+            yield out
+
+    def read_encrypted(self):
+        return "".join(self.iter_encrypted())
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def write_rccm(path, encrypted, fields, compress=None):
+    """Atomically write an RCCM v2 file.
+
+    Canonical base64 ciphertext is stored as raw bytes. `compress=None` keeps the
+    zlib form only when it is actually smaller, which AES output usually isn't.
+    """
+    flags = 0
+    try:
+        payload = base64.b64decode(encrypted, validate=True)
+        if base64.b64encode(payload).decode("ascii") == encrypted:
+            flags |= RCCM_FLAG_RAW
+        else:
+            payload = encrypted.encode("utf-8")
+    except (ValueError, UnicodeEncodeError):
+        payload = encrypted.encode("utf-8")
+    if compress is not False:
+        packed = zlib.compress(payload, 6)
+        if compress or len(packed) < len(payload):
+            payload = packed
+            flags |= RCCM_FLAG_ZLIB
+
+    parts = [_RCCM_HEADER.pack(RCCM_MAGIC, RCCM_VERSION, flags, len(fields))]
+    for name, value in fields.items():
+        if isinstance(value, int):
+            kind, raw = RCCM_FIELD_INT, value.to_bytes(8, "little", signed=True)
+        else:
+            kind, raw = RCCM_FIELD_STR, str(value).encode("utf-8")
+        name = name.encode("ascii")
+        parts += [_RCCM_FIELD.pack(len(name), kind, len(raw)), name, raw]
+    parts += [_RCCM_PAYLOAD.pack(len(payload)), payload]
+
+    with atomic_open(path) as f:
+        f.writelines(parts)
+
+def load_rccm(path):
+    """Read an RCCM file of either format into the legacy config dict (fields + "encrypted")."""
+    with open(path, "rb") as f:
+        magic = f.read(len(RCCM_MAGIC))
+    if magic == RCCM_MAGIC:
+        with RCCMFile(path) as rccm:
+            config = dict(rccm.fields)
+            config["encrypted"] = rccm.read_encrypted()
+        return config
+    # Legacy v1: hex-encoded JSON
+    with open(path, "r", encoding="utf-8") as f:
+        hexdata = f.read().strip()
+    return json.loads(bytes.fromhex(hexdata).decode("utf-8"))
+
+# --------------------
+# Encrypted documents (.bpenc)
+# --------------------
+# header   "BPENC", version u8, scrypt log2(N) u8, r u8, p u8, record size u32,
+#          salt (16), nonce prefix (7)
+# records  AES-256-GCM over `record size` bytes of UTF-8 (the last one may be shorter),
+#          each followed by its 16-byte tag
+# Each nonce is prefix + u32 record counter + a last-record flag byte, and the header
+# is the associated data of every record, so truncation, reordering and header
+# edits all fail authentication.
+DOC_MAGIC = b"BPENC"
+DOC_VERSION = 1
+DOC_RECORD_SIZE = 64 * 1024
+DOC_SCRYPT = (15, 8, 1)  # log2(N), r, p
+DOC_SUFFIX = ".bpenc"
+_DOC_HEADER = struct.Struct("<5sBBBBI16s7s")
+_DOC_TAG_SIZE = 16
+
+class DocumentHeader:
+    """Parsed .bpenc header; `raw` is authenticated with every record."""
+
+    def __init__(self, raw):
+        magic, version, self.log_n, self.r, self.p, self.record_size, self.salt, self.prefix = \
+            _DOC_HEADER.unpack(raw)
+        if magic != DOC_MAGIC:
+            raise ValueError("Not a BunnyPad encrypted document")
+        if version != DOC_VERSION:
+            raise ValueError(f"Unsupported encrypted document version {version}")
+        self.raw = raw
+
+    @property
+    def kdf_params(self):
+        return self.log_n, self.r, self.p
+
+    @classmethod
+    def read(cls, f):
+        raw = f.read(_DOC_HEADER.size)
+        if len(raw) < _DOC_HEADER.size:
+            raise ValueError("Encrypted document header is truncated")
+        return cls(raw)
+
+def is_encrypted_document(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(DOC_MAGIC)) == DOC_MAGIC
+    except OSError:
+        return False
+
+def derive_document_key(passphrase, salt, kdf_params=DOC_SCRYPT):
+    """scrypt a passphrase into a 256-bit document key (deliberately slow: ~0.1 s).
+
+    Results are kept in DERIVED_KEY_CACHE, keyed by a digest of the passphrase
+    rather than the passphrase itself.
+    """
+    log_n, r, p = kdf_params
+    secret = passphrase.encode("utf-8")
+    cache_key = (hashlib.sha256(secret).digest(), bytes(salt), tuple(kdf_params))
+    return DERIVED_KEY_CACHE.get(cache_key, lambda: Scrypt(
+        salt=salt, length=32, n=1 << log_n, r=r, p=p, backend=_BACKEND).derive(secret))
+
+def _doc_nonce(prefix, counter, last):
+    return prefix + struct.pack(">IB", counter, 1 if last else 0)
+
+def encrypt_document(chunks, f, key, salt, kdf_params=DOC_SCRYPT, record_size=DOC_RECORD_SIZE):
+    """Write text chunks to binary file `f` as a .bpenc document, one record at a time."""
+    raw = _DOC_HEADER.pack(DOC_MAGIC, DOC_VERSION, *kdf_params, record_size, salt, os.urandom(7))
+    header = DocumentHeader(raw)
+    aead = AESGCM(key)
+    f.write(raw)
+    counter = 0
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk.encode("utf-8")
+        while len(buf) > record_size:
+            f.write(aead.encrypt(_doc_nonce(header.prefix, counter, False), bytes(buf[:record_size]), raw))
+            del buf[:record_size]
+            counter += 1
+    f.write(aead.encrypt(_doc_nonce(header.prefix, counter, True), bytes(buf), raw))
+
+def decrypt_document(f, key, header=None):
+    """Yield the text of a .bpenc document from binary file `f`; raises InvalidTag on a bad key or file."""
+    if header is None:
+        header = DocumentHeader.read(f)
+    aead = AESGCM(key)
+    text = codecs.getincrementaldecoder("utf-8")()
+    size = header.record_size + _DOC_TAG_SIZE
+    counter = 0
+    record = f.read(size)
+    while True:
+        following = f.read(size)
+        last = not following
+        plain = aead.decrypt(_doc_nonce(header.prefix, counter, last), record, header.raw)
+        out = text.decode(plain, last)
+        if out:
+            yield out
+        if last:
+            return
+        record = following
+        counter += 1
+
+def write_encrypted_document(path, chunks, key, salt, kdf_params=DOC_SCRYPT):
+    with atomic_open(path) as f:
+        encrypt_document(chunks, f, key, salt, kdf_params)
+
+# Wrapped keys: "BPKEY", version u8, scrypt log2(N) u8, r u8, p u8, salt (16), nonce (12),
+# then the AES-GCM sealed key with the header as associated data
+KEY_WRAP_MAGIC = b"BPKEY"
+_KEY_WRAP_HEADER = struct.Struct("<5sBBBB16s12s")
+
+def wrap_key(key, passphrase, kdf_params=DOC_SCRYPT):
+    """Seal a raw key under a passphrase-derived key; the result is safe to store on disk."""
+    salt, nonce = os.urandom(16), os.urandom(12)
+    header = _KEY_WRAP_HEADER.pack(KEY_WRAP_MAGIC, 1, *kdf_params, salt, nonce)
+    kek = derive_document_key(passphrase, salt, kdf_params)
+    return header + AESGCM(kek).encrypt(nonce, key, header)
+
+def unwrap_key(blob, passphrase):
+    """Inverse of wrap_key; raises InvalidTag for a wrong passphrase."""
+    header, sealed = blob[:_KEY_WRAP_HEADER.size], blob[_KEY_WRAP_HEADER.size:]
+    if len(header) < _KEY_WRAP_HEADER.size:
+        raise ValueError("Wrapped key is truncated")
+    magic, version, log_n, r, p, salt, nonce = _KEY_WRAP_HEADER.unpack(header)
+    if magic != KEY_WRAP_MAGIC or version != 1:
+        raise ValueError("Not a BunnyPad wrapped key")
+    kek = derive_document_key(passphrase, salt, (log_n, r, p))
+    return AESGCM(kek).decrypt(nonce, sealed, header)
+
+# --------------------
+# bunnypad-crypto CLI
+# --------------------
+CLI_KEY_ENV = "BUNNYPAD_CRYPTO_KEY"
+CLI_SUFFIX = ".rccmtxt"
+
+_cli_engine = None
+
+def iter_file_chunks(f, size=CRYPTO_CHUNK_SIZE):
+    """Yield a text file in slices of at most `size` characters."""
+    while True:
+        chunk = f.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+def _output_path(src, root, out_dir, mode, suffix):
+    if out_dir:
+        rel = os.path.relpath(src, root) if root else os.path.basename(src)
+        dst = os.path.join(out_dir, rel)
+    else:
+        dst = src
+    if mode == "encrypt":
+        return dst + suffix
+    if dst.endswith(suffix):
+        return dst[:-len(suffix)]
+    return dst + ".dec"
+
+def _process_file(job):
+    """Encrypt or decrypt one file into a temp file next to the target, then rename it over."""
+    global _cli_engine
+    mode, src, dst, shift, key, interval = job
+    if _cli_engine is None:
+        _cli_engine = CryptoEngine()
+    stream = _cli_engine.encrypt_stream if mode == "encrypt" else _cli_engine.decrypt_stream
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".bpcrypt-", dir=os.path.dirname(dst) or ".")
+    try:
+        size = 0
+        with open(src, "r", encoding="utf-8", newline="") as fin, \
+                os.fdopen(fd, "w", encoding="utf-8", newline="") as fout:
+            for piece in stream(iter_file_chunks(fin), shift, key, interval):
+                fout.write(piece)
+                size += len(piece)
+        os.replace(tmp, dst)
+        return src, dst, size, None
+    except Exception as e:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return src, dst, 0, f"{type(e).__name__}: {e}"
+
+def collect_jobs(args, key):
+    jobs = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                if not args.recursive:
+                    dirnames[:] = []
+                for name in sorted(filenames):
+                    if name.startswith(".bpcrypt-"):
+                        continue
+                    # Decrypt only our own output, and never encrypt it a second time
+                    if name.endswith(args.suffix) != (args.mode == "decrypt"):
+                        continue
+                    src = os.path.join(dirpath, name)
+                    dst = _output_path(src, path, args.output, args.mode, args.suffix)
+                    jobs.append((args.mode, src, dst, args.shift, key, args.interval))
+        elif os.path.isfile(path):
+            dst = _output_path(path, None, args.output, args.mode, args.suffix)
+            jobs.append((args.mode, path, dst, args.shift, key, args.interval))
+        else:
+            print(f"bunnypad-crypto: no such file or directory: {path}", file=sys.stderr)
+    return jobs
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="bunnypad-crypto",
+        description="Encrypt or decrypt text files with the BunnyPad RCCMITOWOATAS pipeline.",
+    )
+    parser.add_argument("mode", choices=("encrypt", "decrypt"))
+    parser.add_argument("paths", nargs="+", help="files or directories to process")
+    parser.add_argument("-k", "--key", help=f"AES key (16, 24 or 32 chars); defaults to ${CLI_KEY_ENV}, then a prompt")
+    parser.add_argument("-s", "--shift", type=int, default=3, help="Caesar shift (default: 3)")
+    parser.add_argument("-i", "--interval", type=int, default=2, help="German word interval (default: 2)")
+    parser.add_argument("-o", "--output", help="output directory (default: next to each input)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="descend into subdirectories")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    parser.add_argument("--suffix", default=CLI_SUFFIX, help=f"suffix added on encrypt and stripped on decrypt (default: {CLI_SUFFIX})")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only report errors")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    key = args.key or os.environ.get(CLI_KEY_ENV) or getpass.getpass("AES key: ")
+    if not CryptoEngine.valid_aes_key(key):
+        print("bunnypad-crypto: AES key must be 16, 24, or 32 characters long", file=sys.stderr)
+        return 2
+    jobs = collect_jobs(args, key)
+    if not jobs:
+        print("bunnypad-crypto: nothing to do", file=sys.stderr)
+        return 1
+
+    workers = max(1, min(args.jobs, len(jobs)))
+    started = time.perf_counter()
+    if workers == 1:
+        results = map(_process_file, jobs)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        # Batch small files so per-task IPC doesn't dominate on big trees.
+        results = pool.map(_process_file, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
+    failures = 0
+    try:
+        for src, dst, size, error in results:
+            if error:
+                failures += 1
+                print(f"FAILED {src}: {error}", file=sys.stderr)
+            elif not args.quiet:
+                print(f"{src} -> {dst} ({size:,} chars)")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if not args.quiet:
+        elapsed = time.perf_counter() - started
+        print(f"{len(jobs) - failures}/{len(jobs)} files in {elapsed:.2f}s using {workers} process(es)")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# bunnypad_crypto_bench.py - micro-benchmarks for the RCCMITOWOATAS crypto engine
+"""Times every CryptoEngine stage and both pipelines over a range of input sizes.
+
+    python bunnypad_crypto_bench.py                      # 1 KB .. 100 MB, all stages
+    python bunnypad_crypto_bench.py --quick -o run.json  # up to 1 MB, save results
+    python bunnypad_crypto_bench.py --compare base.json  # flag regressions vs an older run
+
+Throughput is input megabytes per second (best of several runs). Peak memory is
+the tracemalloc high-water mark of one extra, separately traced run, so the
+tracing overhead never leaks into the timings. Like the CLI, this never imports PyQt.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import bunnypad_crypto
+from bunnypad_crypto import CryptoEngine
+
+BENCH_KEY = "0123456789abcdef0123456789abcdef"
+BENCH_SHIFT = 3
+BENCH_INTERVAL = 2
+DEFAULT_SIZES = ["1K", "64K", "1M", "16M", "100M"]
+QUICK_SIZES = ["1K", "64K", "1M"]
+MIN_BENCH_TIME = 0.2  # seconds of repeated runs per measurement, for small inputs
+REGRESSION_THRESHOLD = 0.10  # report slowdowns beyond 10%
+
+def parse_size(text):
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def make_text(size, seed=0):
+    """Deterministic ASCII prose of exactly `size` bytes, with the odd line break."""
+    rnd = random.Random(seed)
+    vocabulary = ["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "BunnyPad",
+                  "notes", "Lorem", "ipsum", "dolor", "sit", "amet", "2024", "hello,", "world."]
+    words = [rnd.choice(vocabulary) for _ in range(4096)]
+    separators = [" "] * 12 + ["\n"]
+    block = "".join(w + rnd.choice(separators) for w in words)
+    return (block * (size // len(block) + 1))[:size]
+
+def build_stages(engine):
+    """(name, prepare, run) triples; prepare(text) builds the stage input and isn't timed."""
+    same = lambda text: text
+    insert = lambda t: engine.insert_german_words(t, BENCH_INTERVAL)
+    caesar = lambda t: engine.caesar_cipher(t, BENCH_SHIFT)
+    aes = lambda t: engine.aes_encrypt(t, BENCH_KEY)
+    encrypt = lambda t: engine.encrypt_pipeline(t, BENCH_SHIFT, BENCH_KEY, BENCH_INTERVAL, debug=False)
+    return [
+        ("insert_german_words", same, insert),
+        ("remove_german_words", insert, engine.remove_german_words),
+        ("caesar_cipher", same, caesar),
+        ("caesar_decipher", caesar, lambda t: engine.caesar_decipher(t, BENCH_SHIFT)),
+        ("hex_encode", same, engine.hex_encode),
+        ("hex_decode", engine.hex_encode, engine.hex_decode),
+        ("base64_encode", same, engine.base64_encode),
+        ("base64_decode", engine.base64_encode, engine.base64_decode),
+        ("aes_encrypt", same, aes),
+        ("aes_decrypt", aes, lambda t: engine.aes_decrypt(t, BENCH_KEY)),
+        ("encrypt_pipeline", same, encrypt),
+        ("decrypt_pipeline", lambda t: encrypt(t)[0],
+         lambda t: engine.decrypt_pipeline(t, BENCH_SHIFT, BENCH_KEY, BENCH_INTERVAL, debug=False)),
+    ]
+
+def time_call(fn, arg, repeat):
+    """Best wall time of fn(arg), repeating small inputs until MIN_BENCH_TIME has passed."""
+    best = float("inf")
+    runs = 0
+    started = time.perf_counter()
+    while runs < repeat or (time.perf_counter() - started < MIN_BENCH_TIME and runs < 1000):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+        runs += 1
+    return best, runs
+
+def peak_memory(fn, arg):
+    tracemalloc.start()
+    try:
+        fn(arg)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_benchmarks(sizes, stage_filter=None, repeat=3, trace=True, log=print):
+    engine = CryptoEngine()
+    results = []
+    for size in sizes:
+        text = make_text(size)
+        for name, prepare, run in build_stages(engine):
+            if stage_filter and name not in stage_filter:
+                continue
+            arg = prepare(text)
+            seconds, runs = time_call(run, arg, repeat if size < 16 * 1024 ** 2 else 1)
+            peak = peak_memory(run, arg) if trace else None
+            result = {
+                "stage": name,
+                "size": size,
+                "seconds": seconds,
+                "runs": runs,
+                "mb_per_s": size / seconds / 1e6 if seconds else None,
+                "peak_bytes": peak,
+            }
+            results.append(result)
+            log(format_result(result))
+            del arg
+    return results
+
+def format_size(size):
+    for unit, factor in (("M", 1024 ** 2), ("K", 1024)):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return str(size)
+
+def format_result(r):
+    peak = f"{r['peak_bytes'] / 1e6:9.1f} MB peak" if r["peak_bytes"] is not None else ""
+    return f"{r['stage']:<20} {format_size(r['size']):>6} {r['mb_per_s']:10.2f} MB/s {peak}"
+
+def environment():
+    try:
+        from cryptography import __version__ as cryptography_version
+    except Exception:
+        cryptography_version = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cryptography": cryptography_version,
+        "numpy": bunnypad_crypto.numpy.__version__ if bunnypad_crypto.numpy is not None else None,
+    }
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD, log=print):
+    """Print the speed ratio against `baseline` per (stage, size); return the regressions."""
+    old = {(r["stage"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        before = old.get((r["stage"], r["size"]))
+        if not before or not before.get("mb_per_s"):
+            continue
+        ratio = r["mb_per_s"] / before["mb_per_s"]
+        flag = ""
+        if ratio < 1 - threshold:
+            flag = "  REGRESSION"
+            regressions.append((r["stage"], r["size"], ratio))
+        log(f"{r['stage']:<20} {format_size(r['size']):>6} {ratio:6.2f}x{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="bunnypad-crypto-bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=None, help=f"input sizes (default: {' '.join(DEFAULT_SIZES)})")
+    parser.add_argument("--quick", action="store_true", help=f"only {' '.join(QUICK_SIZES)}")
+    parser.add_argument("--stages", nargs="+", help="only these stages")
+    parser.add_argument("--repeat", type=int, default=3, help="minimum timed runs per measurement (default: 3)")
+    parser.add_argument("--no-trace", action="store_true", help="skip the tracemalloc peak-memory run")
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", metavar="JSON", help="compare against an earlier --output file")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="slowdown that counts as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in (args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES))]
+    results = run_benchmarks(sizes, args.stages, args.repeat, not args.no_trace)
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nvs {args.compare} ({baseline.get('environment', {}).get('timestamp', '?')}):")
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# bunnypad_pdf.py - fpdf fallback for PDF export
+"""Qt-free PDF writer for Qt builds without QPdfWriter.
+
+Works with PyFPDF 1.7 (the `fpdf` package the installer pulls in) and with
+fpdf2; PdfExportWorker in the GUI calls write_pdf_fpdf from here.
+"""
+
+import functools
+import os
+
+try:
+    import fpdf
+    from fpdf import FPDF
+except Exception:
+    fpdf = FPDF = None
+
+try:
+    from fpdf.enums import XPos, YPos  # fpdf2; PyFPDF only knows cell(ln=1)
+except Exception:
+    XPos = YPos = None
+
+PDF_MARGINS_MM = (15, 15, 15, 15)
+PDF_TAB_SPACES = 8
+PDF_FONT_SIZE = 11  # points, for the fpdf fallback
+PDF_FONT_FILES = (  # Unicode TTFs tried, in order, by the fpdf fallback
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu-sans-fonts/DejaVuSans.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+)
+PYFPDF_SUBSET_VERSION = "1.7.2"  # the PyFPDF release whose font `subset` list PdfFontSubset replaces
+
+@functools.lru_cache(maxsize=None)
+def find_pdf_font():
+    """Path of the first Unicode TTF available to the fpdf fallback, or None."""
+    candidates = list(PDF_FONT_FILES)
+    windir = os.environ.get("WINDIR")
+    if windir:
+        candidates[:0] = [os.path.join(windir, "Fonts", name) for name in ("arial.ttf", "segoeui.ttf")]
+    return next((path for path in candidates if os.path.isfile(path)), None)
+
+class PdfCharWidths(dict):
+    """Width of each character in one fpdf font and size, measured on first use.
+
+    `pdf` is only set while an export is running, so the shared cache does not
+    keep the last document's FPDF object (and all its pages) alive.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.pdf = None
+
+    def __missing__(self, ch):
+        width = self[ch] = self.pdf.get_string_width(ch)
+        return width
+
+_PDF_CHAR_WIDTHS = {}  # (font file, size) -> PdfCharWidths, shared by every export
+
+class PdfFontSubset(list):
+    """Drop-in for PyFPDF 1.7.2's per-font `subset` list that keeps each code point once.
+
+    PyFPDF appends every character it draws, duplicates included, then tests
+    `cid in subset` for each code point in the font while writing the file, which
+    makes output() quadratic in the document length.
+    """
+
+    def __init__(self, items=()):
+        super().__init__(dict.fromkeys(items))
+        self._seen = set(self)
+
+    def append(self, item):
+        if item not in self._seen:
+            self._seen.add(item)
+            super().append(item)
+
+    def __contains__(self, item):
+        return item in self._seen
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._seen = set(self)
+
+def wrap_pdf_line(line, widths, max_width):
+    """Yield the rows of `line` that fit `max_width`, breaking after spaces where possible."""
+    if sum(map(widths.__getitem__, line)) <= max_width:
+        yield line
+        return
+    start, width, last_space = 0, 0.0, -1
+    for i, ch in enumerate(line):
+        w = widths[ch]
+        if width + w > max_width and i > start:
+            cut = last_space + 1 if last_space >= start else i
+            yield line[start:cut]
+            width = sum(map(widths.__getitem__, line[cut:i]))
+            start, last_space = cut, -1
+        if ch == " ":
+            last_space = i
+        width += w
+    yield line[start:]
+
+def write_pdf_fpdf(lines, file_path, on_page=None, cancelled=None) -> bool:
+    """Write an iterable of lines as PDF with fpdf, one wrapped row at a time.
+
+    `on_page(pages)` is called as pages fill up; returns False if `cancelled()`
+    turned true. fpdf assembles the file itself in `output()`, so unlike
+    PdfExportWorker's QPdfWriter path its memory still grows with the page count.
+    """
+    pdf = FPDF(unit="mm", format="A4")
+    left, top, right, bottom = PDF_MARGINS_MM
+    pdf.set_margins(left, top, right)
+    pdf.set_auto_page_break(True, bottom)
+    font_path = find_pdf_font()
+    if font_path:
+        if XPos is None:
+            pdf.add_font("BunnyPadUnicode", "", font_path, uni=True)
+        else:  # fpdf2 has no `uni` flag; every TTF is Unicode there
+            pdf.add_font("BunnyPadUnicode", "", font_path)
+        pdf.set_font("BunnyPadUnicode", size=PDF_FONT_SIZE)
+        if getattr(fpdf, "FPDF_VERSION", None) == PYFPDF_SUBSET_VERSION:
+            pdf.current_font["subset"] = PdfFontSubset(pdf.current_font["subset"])
+    else:
+        pdf.set_font("Helvetica", size=PDF_FONT_SIZE)
+    widths = _PDF_CHAR_WIDTHS.setdefault((font_path, PDF_FONT_SIZE), PdfCharWidths())
+    max_width = pdf.w - left - right
+    line_height = PDF_FONT_SIZE * 0.3528 * 1.3  # points to mm, plus leading
+    next_line = {"ln": 1} if XPos is None else {"new_x": XPos.LMARGIN, "new_y": YPos.NEXT}
+    pdf.add_page()
+    page = 1
+    widths.pdf = pdf
+    try:
+        for line in lines:
+            if cancelled is not None and cancelled():
+                return False
+            line = line.expandtabs(PDF_TAB_SPACES)
+            if font_path is None:  # core fonts are Latin-1 only
+                line = line.encode("latin-1", "replace").decode("latin-1")
+            for row in wrap_pdf_line(line, widths, max_width):
+                pdf.cell(0, line_height, row, **next_line)
+            if on_page is not None and pdf.page_no() != page:
+                on_page(page)
+                page = pdf.page_no()
+    finally:
+        widths.pdf = None
+    pdf.output(file_path)
+    if on_page is not None:
+        on_page(page)
+    return True
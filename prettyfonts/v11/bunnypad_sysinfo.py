@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# bunnypad_sysinfo.py - Linux hardware probes for the System Information dialog
+"""Qt-free home of the /proc and /sys readers behind BunnyPad's system info.
+
+Straight reads of /proc and /sys, so system info needs no lscpu/lshw/lspci.
+Hardware doesn't change while BunnyPad runs, so each probe runs once per process.
+"""
+
+import functools
+import glob
+import gzip
+import logging
+import os
+import platform
+
+PCI_IDS_FILES = (
+    "/usr/share/hwdata/pci.ids",
+    "/usr/share/misc/pci.ids",
+    "/usr/share/pci.ids",
+    "/usr/share/hwdata/pci.ids.gz",
+    "/usr/share/misc/pci.ids.gz",
+)
+
+logger = logging.getLogger(__name__)
+
+# (CPU implementer, CPU part) from an ARM /proc/cpuinfo, for the cores lscpu would name
+ARM_CPU_PARTS = {
+    ("0x41", "0xc07"): "Cortex-A7", ("0x41", "0xc09"): "Cortex-A9", ("0x41", "0xc0f"): "Cortex-A15",
+    ("0x41", "0xd03"): "Cortex-A53", ("0x41", "0xd04"): "Cortex-A35", ("0x41", "0xd05"): "Cortex-A55",
+    ("0x41", "0xd07"): "Cortex-A57", ("0x41", "0xd08"): "Cortex-A72", ("0x41", "0xd09"): "Cortex-A73",
+    ("0x41", "0xd0a"): "Cortex-A75", ("0x41", "0xd0b"): "Cortex-A76", ("0x41", "0xd0c"): "Neoverse-N1",
+    ("0x41", "0xd0d"): "Cortex-A77", ("0x41", "0xd40"): "Neoverse-V1", ("0x41", "0xd41"): "Cortex-A78",
+    ("0x41", "0xd44"): "Cortex-X1", ("0x41", "0xd46"): "Cortex-A510", ("0x41", "0xd47"): "Cortex-A710",
+    ("0x41", "0xd48"): "Cortex-X2", ("0x41", "0xd49"): "Neoverse-N2", ("0x41", "0xd4f"): "Neoverse-V2",
+}
+
+@functools.lru_cache(maxsize=None)
+def read_proc_cpuinfo(path="/proc/cpuinfo") -> dict:
+    """The first value of every key in /proc/cpuinfo.
+
+    The whole file is read: on ARM, "Hardware" and "Model" come in a block of
+    their own after all the per-processor blocks.
+    """
+    fields = {}
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                key, sep, value = line.partition(":")
+                if sep:
+                    fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        pass
+    return fields
+
+def linux_cpu_model(path="/proc/cpuinfo"):
+    cpuinfo = read_proc_cpuinfo(path)
+    if cpuinfo.get("model name"):  # x86, and some ARM kernels
+        return cpuinfo["model name"]
+    part = ARM_CPU_PARTS.get((cpuinfo.get("CPU implementer", "").lower(), cpuinfo.get("CPU part", "").lower()))
+    board = cpuinfo.get("Model") or cpuinfo.get("Hardware")
+    if part:
+        return f"{part} ({board})" if board else part
+    for key in ("Model", "Hardware", "Processor", "cpu model", "cpu"):
+        if cpuinfo.get(key):
+            return cpuinfo[key]
+    return None
+
+@functools.lru_cache(maxsize=None)
+def linux_mem_total():
+    """MemTotal from /proc/meminfo in bytes, or None."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def _read_sysfs_id(path):
+    try:
+        with open(path, "r") as f:
+            return f.read().strip().lower().replace("0x", "")
+    except OSError:
+        return None
+
+def linux_display_devices() -> list:
+    """(vendor, device) PCI ids of the GPUs: DRM cards first, then any PCI display controller."""
+    device_dirs = [path for path in glob.glob("/sys/class/drm/card*/device") if "-" not in os.path.basename(os.path.dirname(path))]
+    if not device_dirs:
+        device_dirs = [path for path in glob.glob("/sys/bus/pci/devices/*")
+                       if (_read_sysfs_id(os.path.join(path, "class")) or "").startswith("03")]
+    devices, seen = [], set()
+    for path in sorted(device_dirs):
+        real = os.path.realpath(path)
+        vendor = _read_sysfs_id(os.path.join(path, "vendor"))
+        device = _read_sysfs_id(os.path.join(path, "device"))
+        if real in seen or not vendor or not device:
+            continue
+        seen.add(real)
+        devices.append((vendor, device))
+    return devices
+
+@functools.lru_cache(maxsize=None)
+def lookup_pci_names(ids: frozenset) -> dict:
+    """{(vendor, device): (vendor name, device name)} from the PCI ID database.
+
+    Vendors are listed in order, so the scan stops once every id is found.
+    """
+    path = next((p for p in PCI_IDS_FILES if os.path.isfile(p)), None)
+    if path is None:
+        return {}
+    wanted = {vendor for vendor, device in ids}
+    names = {}
+    opener = gzip.open if path.endswith(".gz") else open
+    try:
+        with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+            vendor = vendor_name = None
+            for line in f:
+                if line.startswith("#") or not line.strip():
+                    continue
+                if not line.startswith("\t"):
+                    if line.startswith("C "):  # device classes follow the vendor list
+                        break
+                    vendor, vendor_name = line[:4].lower(), line[4:].strip()
+                    if vendor not in wanted and len(names) == len(ids):
+                        break
+                    names.update({key: (vendor_name, None) for key in ids if key[0] == vendor and key not in names})
+                elif vendor in wanted and not line.startswith("\t\t"):
+                    key = (vendor, line[1:5].lower())
+                    if key in ids:
+                        names[key] = (vendor_name, line[5:].strip())
+    except OSError as e:
+        logger.warning("Could not read %s: %s", path, e)
+    return names
+
+@functools.lru_cache(maxsize=None)
+def linux_gpu_names() -> tuple:
+    devices = linux_display_devices()
+    names = lookup_pci_names(frozenset(devices))
+    result = []
+    for vendor, device in devices:
+        vendor_name, device_name = names.get((vendor, device), (None, None))
+        if device_name:
+            result.append(f"{vendor_name} {device_name}")
+        elif vendor_name:
+            result.append(f"{vendor_name} [{vendor}:{device}]")
+        else:
+            result.append(f"PCI device {vendor}:{device}")
+    return tuple(result)
+
+def linux_os_name():
+    """PRETTY_NAME from os-release, when the distro package isn't installed."""
+    try:
+        return platform.freedesktop_os_release().get("PRETTY_NAME")
+    except (OSError, AttributeError):
+        return None
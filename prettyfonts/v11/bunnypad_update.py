@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# bunnypad_update.py - GitHub release lookup for the update checker
+"""Qt-free part of BunnyPad's update check, so it can be run against a stub HTTP server.
+
+The GUI's update_checker thread calls fetch_release_info from here and decides
+what is newer; this module only talks to the releases API and keeps the
+conditional-request state.
+"""
+
+import json
+import logging
+import os
+import time
+
+try:
+    import requests
+except Exception:
+    requests = None
+
+GITHUB_API = os.environ.get("BUNNYPAD_GITHUB_API", "https://api.github.com")  # point at a stub server to test
+UPDATE_PRERELEASE_PAGE = 10  # releases fetched when pre-releases count
+UPDATE_TIMEOUT = 15  # seconds per request
+
+logger = logging.getLogger(__name__)
+
+def summarize_releases(releases) -> dict:
+    """{"stable": ..., "prerelease": ...} for the newest release of each kind."""
+    info = {}
+    latest_stable = None
+    latest_prerelease = None
+    for r in releases:
+        if r.get("draft", False):
+            continue
+        if r.get("prerelease", False):
+            if latest_prerelease is None or (r.get("published_at") or "") > (latest_prerelease.get("published_at") or ""):
+                latest_prerelease = r
+        else:
+            if latest_stable is None or (r.get("published_at") or "") > (latest_stable.get("published_at") or ""):
+                latest_stable = r
+    if latest_stable:
+        info["stable"] = {"version": latest_stable.get("tag_name"), "url": latest_stable.get("html_url"), "date": latest_stable.get("published_at")}
+    if latest_prerelease:
+        info["prerelease"] = {"version": latest_prerelease.get("tag_name"), "url": latest_prerelease.get("html_url"), "date": latest_prerelease.get("published_at")}
+    return info
+
+def load_update_state(path) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_update_state(state: dict, path):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not save update check state: %s", e)
+
+def fetch_release_info(repo_owner, repo_name, use_pre_release, api_base, state_path, user_agent,
+                       timeout=UPDATE_TIMEOUT):
+    """Latest release info from GitHub as (info, HTTP status).
+
+    Without pre-releases only /releases/latest is fetched; with them, one short
+    page of /releases, plus /releases/latest when that page is all pre-releases.
+    The ETag and Last-Modified of the previous answer are sent back, and a 304
+    returns the stored result without reading a body. A 304 with nothing stored
+    (a damaged or older state file) is asked again without the validators.
+    """
+    base = f"{api_base.rstrip('/')}/repos/{repo_owner}/{repo_name}/releases"
+    url = f"{base}?per_page={UPDATE_PRERELEASE_PAGE}" if use_pre_release else f"{base}/latest"
+    state = load_update_state(state_path)
+    if state.get("url") != url:
+        state = {}
+    plain_headers = {"Accept": "application/vnd.github+json", "User-Agent": user_agent}
+    headers = dict(plain_headers)
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    resp = requests.get(url, headers=headers, timeout=timeout)
+    if resp.status_code == 304:
+        if "info" in state:
+            return state["info"], 304
+        resp = requests.get(url, headers=plain_headers, timeout=timeout)
+    if resp.status_code == 404 and not use_pre_release:
+        info = {}  # nothing but pre-releases (or no releases at all) yet
+    else:
+        resp.raise_for_status()
+        data = resp.json()
+        info = summarize_releases(data if isinstance(data, list) else [data])
+        if use_pre_release and "stable" not in info:
+            # more pre-releases than fit on the page since the last stable release
+            latest = requests.get(f"{base}/latest", headers=plain_headers, timeout=timeout)
+            if latest.status_code != 404:
+                latest.raise_for_status()
+                info.update(summarize_releases([latest.json()]))
+    save_update_state({
+        "url": url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "info": info,
+        "checked": time.time(),
+    }, state_path)
+    return info, resp.status_code
@@ -0,0 +1,81 @@
+# test_bunnypad_crypto.py - regression tests for the Qt-free crypto engine
+"""Run with `python -m pytest prettyfonts/v11` or `python -m unittest` from this directory."""
+
+import random
+import unittest
+from unittest import mock
+
+import bunnypad_crypto
+from bunnypad_crypto import CryptoEngine, GermanWordInserter
+
+SAMPLES = [
+    "Tokyo東京 is big",
+    "日本語のテキスト と かな",
+    "한국어 문장입니다 🐰 emoji 🥕",
+    "tabs\tand　ideographic　spaces and more",
+    "",
+    "   leading and trailing   ",
+]
+
+def random_text(rnd, length):
+    alphabet = "ab Z9\t\n  　、東京かな한🐰§"
+    return "".join(rnd.choice(alphabet) for _ in range(length))
+
+class GermanWordTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = CryptoEngine()
+        rnd = random.Random(35)
+        self.texts = SAMPLES + [random_text(rnd, rnd.randrange(1, 200)) for _ in range(300)]
+
+    def test_word_ends_match_regex_path(self):
+        if bunnypad_crypto.numpy is None:
+            self.skipTest("numpy is not installed")
+        inserter = GermanWordInserter(bunnypad_crypto.GERMAN_MARKER, bunnypad_crypto.GERMAN_WORDS, 1)
+        for text in self.texts:
+            expected = [m.end() for m in GermanWordInserter.WORD.finditer(text)]
+            self.assertEqual(list(inserter.word_ends(text)), expected, repr(text))
+
+    def test_insert_matches_regex_path(self):
+        for text in self.texts:
+            for interval in (1, 2, 3):
+                inserted = self.engine.insert_german_words(text, interval)
+                with mock.patch.object(bunnypad_crypto, "numpy", None):
+                    self.assertEqual(self.engine.insert_german_words(text, interval), inserted, repr(text))
+
+    def test_insert_remove_round_trip(self):
+        for text in self.texts:
+            if bunnypad_crypto.GERMAN_MARKER in text:
+                continue  # the remover drops marker words the user typed too
+            for interval in (1, 2, 3):
+                inserted = self.engine.insert_german_words(text, interval)
+                self.assertEqual(self.engine.remove_german_words(inserted), text, repr(text))
+
+    def test_cjk_survives_round_trip(self):
+        inserted = self.engine.insert_german_words("Tokyo東京 is big", 1)
+        self.assertEqual(self.engine.remove_german_words(inserted), "Tokyo東京 is big")
+
+class AESBatchTests(unittest.TestCase):
+    KEY = "0123456789abcdef0123456789abcdef"
+
+    def setUp(self):
+        self.texts = ["", "a", "x" * 15, "y" * 16, "z" * 17, "héllo wörld 東京 🐰" * 50] + SAMPLES
+
+    def test_batches_interoperate_with_single_calls(self):
+        for key in ("0123456789abcdef", "0123456789abcdef01234567", self.KEY):
+            sealed = CryptoEngine.encrypt_many(self.texts, key)
+            self.assertEqual([CryptoEngine.aes_decrypt(c, key) for c in sealed], self.texts)
+            singles = [CryptoEngine.aes_encrypt(t, key) for t in self.texts]
+            self.assertEqual(CryptoEngine.decrypt_many(singles, key), self.texts)
+
+    def test_fresh_iv_per_message(self):
+        sealed = CryptoEngine.encrypt_many(["same"] * 8, self.KEY)
+        self.assertEqual(len(set(sealed)), 8)
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            CryptoEngine.encrypt_many(["x"], "short")
+        with self.assertRaises(ValueError):
+            CryptoEngine.decrypt_many(["AAAA"], self.KEY)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# test_bunnypad_pdf.py - the fpdf fallback of PDF export, under PyFPDF 1.7.2 or fpdf2
+"""Run with `python -m pytest prettyfonts/v11` or `python -m unittest` from this directory."""
+
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+from unittest import mock
+
+import bunnypad_pdf
+from bunnypad_pdf import PdfFontSubset, write_pdf_fpdf
+
+# any Unicode TTF will do; the exporter's own list may be missing on a test box
+TEST_FONTS = list(bunnypad_pdf.PDF_FONT_FILES) + sorted(glob.glob("/usr/share/fonts/**/DejaVuSans*.ttf", recursive=True))
+TEST_FONT = next((path for path in TEST_FONTS if os.path.isfile(path)), None)
+
+LINES = ["Größe, Tokyo and tabs\there", "x" * 500] * 200
+
+
+class PdfFontSubsetTests(unittest.TestCase):
+    def test_keeps_each_code_point_once(self):
+        subset = PdfFontSubset([0, 65, 65, 66])
+        for cid in (66, 67, 65, 67):
+            subset.append(cid)
+        self.assertEqual(list(subset), [0, 65, 66, 67])
+        self.assertIn(67, subset)
+        del subset[0]  # PyFPDF drops the .notdef entry before subsetting
+        self.assertEqual(list(subset), [65, 66, 67])
+        self.assertNotIn(0, subset)
+
+
+@unittest.skipUnless(bunnypad_pdf.FPDF, "fpdf is not installed")
+class WritePdfTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "out.pdf")
+        self.made = []
+        made = self.made
+
+        class RecordingFPDF(bunnypad_pdf.FPDF):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                made.append(self)
+
+        patcher = mock.patch.object(bunnypad_pdf, "FPDF", RecordingFPDF)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, font_path):
+        pages = []
+        with mock.patch.object(bunnypad_pdf, "find_pdf_font", lambda: font_path), warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            self.assertTrue(write_pdf_fpdf(iter(LINES), self.path, pages.append))
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(5), b"%PDF-")
+        self.assertGreater(pages[-1], 1)
+        return self.made[-1]
+
+    def test_core_font(self):
+        self.write(None)
+
+    @unittest.skipUnless(TEST_FONT, "no Unicode TTF found")
+    def test_unicode_font(self):
+        pdf = self.write(TEST_FONT)
+        subset = pdf.fonts["bunnypadunicode"].get("subset") if bunnypad_pdf.XPos is None else None
+        if bunnypad_pdf.fpdf.FPDF_VERSION == bunnypad_pdf.PYFPDF_SUBSET_VERSION:
+            self.assertIsInstance(subset, PdfFontSubset)
+            self.assertEqual(len(subset), len(set(subset)))
+        else:
+            self.assertNotIsInstance(subset, PdfFontSubset)  # only PyFPDF 1.7.2 is patched
+
+    def test_cancel(self):
+        self.assertFalse(write_pdf_fpdf(iter(LINES), self.path, cancelled=lambda: True))
+
+
+if __name__ == "__main__":
+    unittest.main()
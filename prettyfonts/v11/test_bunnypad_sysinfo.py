@@ -0,0 +1,100 @@
+# test_bunnypad_sysinfo.py - Linux hardware probes behind the System Information dialog
+"""Run with `python -m pytest prettyfonts/v11` or `python -m unittest` from this directory."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from bunnypad_sysinfo import linux_cpu_model, read_proc_cpuinfo
+
+PI4_CPUINFO = """\
+processor	: 0
+BogoMIPS	: 108.00
+Features	: fp asimd evtstrm crc32 cpuid
+CPU implementer	: 0x41
+CPU architecture: 8
+CPU variant	: 0x0
+CPU part	: 0xd08
+CPU revision	: 3
+
+processor	: 1
+BogoMIPS	: 108.00
+Features	: fp asimd evtstrm crc32 cpuid
+CPU implementer	: 0x41
+CPU architecture: 8
+CPU variant	: 0x0
+CPU part	: 0xd08
+CPU revision	: 3
+
+Hardware	: BCM2835
+Revision	: c03114
+Serial		: 10000000deadbeef
+Model		: Raspberry Pi 4 Model B Rev 1.4
+"""
+
+ARMV7_CPUINFO = """\
+processor	: 0
+model name	: ARMv7 Processor rev 4 (v7l)
+BogoMIPS	: 38.40
+
+Hardware	: BCM2835
+Model		: Raspberry Pi 3 Model B Rev 1.2
+"""
+
+X86_CPUINFO = """\
+processor	: 0
+vendor_id	: GenuineIntel
+model name	: Intel(R) Core(TM) i7-8650U CPU @ 1.90GHz
+
+processor	: 1
+vendor_id	: GenuineIntel
+model name	: Intel(R) Core(TM) i7-8650U CPU @ 1.90GHz
+"""
+
+UNKNOWN_ARM_CPUINFO = """\
+processor	: 0
+CPU implementer	: 0x51
+CPU part	: 0x801
+
+Hardware	: Qualcomm Technologies, Inc SDM845
+"""
+
+class CpuInfoTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def cpuinfo_file(self, text):
+        # a new name per sample, since the probes are cached by path
+        path = os.path.join(self.dir, f"cpuinfo-{len(os.listdir(self.dir))}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def cpu_model(self, text):
+        return linux_cpu_model(self.cpuinfo_file(text))
+
+    def test_aarch64_reads_trailing_block(self):
+        fields = read_proc_cpuinfo(self.cpuinfo_file(PI4_CPUINFO))
+        self.assertEqual(fields["Hardware"], "BCM2835")
+        self.assertEqual(fields["Model"], "Raspberry Pi 4 Model B Rev 1.4")
+        self.assertEqual(fields["processor"], "0")  # first value wins
+
+    def test_aarch64_model(self):
+        self.assertEqual(self.cpu_model(PI4_CPUINFO), "Cortex-A72 (Raspberry Pi 4 Model B Rev 1.4)")
+
+    def test_unknown_arm_part_falls_back_to_hardware(self):
+        self.assertEqual(self.cpu_model(UNKNOWN_ARM_CPUINFO), "Qualcomm Technologies, Inc SDM845")
+
+    def test_model_name_wins(self):
+        self.assertEqual(self.cpu_model(ARMV7_CPUINFO), "ARMv7 Processor rev 4 (v7l)")
+        self.assertEqual(self.cpu_model(X86_CPUINFO), "Intel(R) Core(TM) i7-8650U CPU @ 1.90GHz")
+
+    def test_missing_file(self):
+        self.assertIsNone(linux_cpu_model(os.path.join(self.dir, "no-such-cpuinfo")))
+
+if __name__ == "__main__":
+    unittest.main()
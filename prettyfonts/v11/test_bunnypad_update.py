@@ -0,0 +1,102 @@
+# test_bunnypad_update.py - fetch_release_info against a stub GitHub API
+"""Run with `python -m pytest prettyfonts/v11` or `python -m unittest` from this directory."""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import bunnypad_update
+from bunnypad_update import fetch_release_info
+
+ETAG = '"releases-1"'
+STABLE = {"tag_name": "v11.0.27000.0915", "html_url": "https://example.invalid/stable",
+          "published_at": "2026-09-15T00:00:00Z", "prerelease": False}
+PRERELEASES = [{"tag_name": f"v11.1.0-beta.{i}", "html_url": f"https://example.invalid/beta{i}",
+                "published_at": f"2026-10-{i + 1:02d}T00:00:00Z", "prerelease": True}
+               for i in range(bunnypad_update.UPDATE_PRERELEASE_PAGE)]
+
+
+class StubGitHub(BaseHTTPRequestHandler):
+    """/releases/latest and a page of /releases, both with an ETag that answers 304."""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path.endswith("/releases/latest"):
+            body = STABLE
+        elif "/releases?per_page=" in self.path:
+            body = PRERELEASES
+        else:
+            self.send_error(404)
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipUnless(bunnypad_update.requests, "requests is not installed")
+class FetchReleaseInfoTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubGitHub)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.api = f"http://127.0.0.1:{self.server.server_port}"
+        self.dir = tempfile.mkdtemp()
+        self.state_path = os.path.join(self.dir, "update-check.json")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.dir)
+
+    def fetch(self, use_pre_release=False):
+        return fetch_release_info("owner", "repo", use_pre_release, self.api, self.state_path, "BunnyPad/test")
+
+    def test_etag_is_stored_and_answered_with_304(self):
+        info, status = self.fetch()
+        self.assertEqual(status, 200)
+        self.assertEqual(info["stable"]["version"], STABLE["tag_name"])
+        with open(self.state_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["etag"], ETAG)
+
+        self.assertEqual(self.fetch(), (info, 304))
+        self.assertEqual(self.server.requests[-1], ("/repos/owner/repo/releases/latest", ETAG))
+
+    def test_304_without_stored_result_asks_again(self):
+        url = f"{self.api}/repos/owner/repo/releases/latest"
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "etag": ETAG}, f)  # no "info", as from an older version
+        info, status = self.fetch()
+        self.assertEqual(status, 200)
+        self.assertEqual(info["stable"]["version"], STABLE["tag_name"])
+        self.assertEqual([etag for path, etag in self.server.requests], [ETAG, None])
+
+    def test_page_of_prereleases_falls_back_to_latest(self):
+        info, status = self.fetch(use_pre_release=True)
+        self.assertEqual(status, 200)
+        self.assertEqual(info["prerelease"]["version"], PRERELEASES[-1]["tag_name"])
+        self.assertEqual(info["stable"]["version"], STABLE["tag_name"])
+        self.assertEqual([path for path, etag in self.server.requests],
+                         [f"/repos/owner/repo/releases?per_page={bunnypad_update.UPDATE_PRERELEASE_PAGE}",
+                          "/repos/owner/repo/releases/latest"])
+
+        self.assertEqual(self.fetch(use_pre_release=True), (info, 304))  # stable kept in the stored result
+
+
+if __name__ == "__main__":
+    unittest.main()
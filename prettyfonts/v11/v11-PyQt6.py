@@ -10,20 +10,30 @@ r"""
 """
 
 import datetime
+import functools
 import importlib
+import io
 import logging
 import os
 import platform
 import shutil
 import subprocess
 import sys
-import textwrap
+import tempfile
+import time
 import unicodedata
 import webbrowser
 import random
+import re
 import json
-import base64
 import binascii
+import bisect
+import hashlib
+import struct
+import zlib
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Optional third-party libraries
@@ -42,17 +52,18 @@ try:
 except Exception:
     requests = None
 
-try:
-    from fpdf import FPDF
-except Exception:
-    FPDF = None
-
 # PyQt6 imports
 try:
     from PyQt6.QtCore import (
         QCoreApplication,
+        QEventLoop,
         QFile,
+        QMarginsF,
+        QObject,
         QPoint,
+        QPointF,
+        QRect,
+        QSettings,
         QSize,
         Qt,
         QTextStream,
@@ -65,39 +76,47 @@ try:
         QColor,
         QFont,
         QFontMetrics,
+        QFontMetricsF,
         QGuiApplication,
         QIcon,
         QPainter,
         QPixmap,
+        QPolygonF,
         QTextCursor,
         QTextDocument,
+        QTextLayout,
+        QTextOption,
         QFontDatabase,
         QMouseEvent,
         QPaintEvent,
+        QRawFont,
         QAction,  # moved here from QtWidgets
     )
-    from PyQt6.QtPrintSupport import QPrintDialog, QPrinter
+    from PyQt6.QtPrintSupport import QAbstractPrintDialog, QPrintDialog, QPrinter, QPrintPreviewDialog
     from PyQt6.QtWidgets import (
         QApplication,
         QCheckBox,
         QDialog,
         QDockWidget,
         QFileDialog,
+        QFontComboBox,
         QFontDialog,
         QGridLayout,
         QInputDialog,
         QLabel,
         QLCDNumber,
+        QListWidget,
+        QListWidgetItem,
         QMainWindow,
         QMenu,
         QMenuBar,
         QMessageBox,
         QProgressBar,
+        QProgressDialog,
         QPushButton,
         QStatusBar,
         QTextEdit,
         QToolBar,
-        QToolTip,
         QVBoxLayout,
         QWidget,
         QGroupBox,
@@ -208,13 +227,19 @@ try:
     CLIPBOARD_ENABLED = True
 except ImportError:
     CLIPBOARD_ENABLED = False
+# QPdfWriter is left out of some stripped-down Qt builds; write_pdf_fpdf covers those
 try:
-    from cryptography.hazmat.primitives import padding
-    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-    from cryptography.hazmat.backends import default_backend
+    from PyQt6.QtGui import QPageLayout, QPageSize, QPdfWriter
 except ImportError:
-    print("Cryptography package not found. Install with: pip install cryptography")
-    sys.exit(1)
+    QPdfWriter = None
+from bunnypad_crypto import (
+    DOC_SUFFIX, CryptoEngine, DocumentHeader, InvalidTag, StageLog, atomic_open, decrypt_document,
+    derive_document_key, is_encrypted_document, iter_text_chunks, load_rccm, text_transform, unwrap_key,
+    write_encrypted_document, write_rccm, wrap_key
+)
+from bunnypad_sysinfo import linux_cpu_model, linux_gpu_names, linux_mem_total, linux_os_name
+from bunnypad_pdf import FPDF, PDF_MARGINS_MM, PDF_TAB_SPACES, write_pdf_fpdf
+from bunnypad_update import GITHUB_API, fetch_release_info
 
 # --------------------
 # Constants and paths
@@ -224,21 +249,39 @@ APP_NAME = "BunnyPad"
 ORGANIZATION_NAME = "GSYT Productions"
 REPO_OWNER = "GSYT-Productions"
 REPO_NAME = "BunnyPad-SRC"
+IS_ANDROID = sys.platform.startswith("android")  # simple flag for Android
 BUNNYPAD_TEMP = os.path.join(os.path.expanduser("~"), "BunnyPadTemp")
 os.makedirs(BUNNYPAD_TEMP, exist_ok=True)
+BUNNYPAD_CACHE = os.path.join(BUNNYPAD_TEMP, "cache")
 STATE_FILE = os.path.join(BUNNYPAD_TEMP, "state.json")
 DIRTY_FILE = os.path.join(BUNNYPAD_TEMP, "dirty")
+AUTOSAVE_KEY_FILE = os.path.join(BUNNYPAD_TEMP, "autosave.key")  # session key, wrapped by a passphrase
 
 # ---------------- Crypto Engine ----------------
-GERMAN_MARKER = "§"
-GERMAN_WORDS = [
-    "dost", "orden", "meer", "baum", "vogel", "fluss", "himmel", "freude",
-    "licht", "schloss", "apfel", "garten", "wasser", "freund", "blume", "straße",
-    "morgen", "nacht", "sonne", "mond", "stern", "eule", "hausaufgabe", "katze",
-    "wolke", "freundlich", "schnell", "langsam", "laut", "ruhig", "schön",
-    "schlecht", "freundschaft", "abenteuer", "trinken", "laufen", "springen",
-    "tanzen", "schreiben", "musizieren", "singen", "fühlen", "träumen", "denken"
-]
+# The engine itself lives in bunnypad_crypto.py so the CLI can use it without PyQt.
+CRYPTO_DEBUG_PREVIEW = 4096  # characters kept per stage in the GUI debug view
+TRANSFORM_CHUNK_SIZE = 64 * 1024  # document positions read and rewritten per Edit > Transform step
+
+# System information
+SYSINFO_CACHE_FILE = os.path.join(BUNNYPAD_CACHE, "sysinfo.json")
+SYSINFO_CACHE_TTL = 24 * 60 * 60  # seconds; cached hardware probes are also dropped on reboot
+SYSINFO_CACHE_VERSION = 2  # bump when a probe's output changes
+
+# Update checks
+# The GitHub release lookup lives in bunnypad_update.py so it can be tested without Qt.
+UPDATE_STATE_FILE = os.path.join(BUNNYPAD_CACHE, "update-check.json")  # validators + result of the last check
+UPDATE_CHECK_INTERVAL = 24 * 60 * 60  # seconds between background checks
+UPDATE_STARTUP_DELAY = 60  # seconds after startup before the first background check
+UPDATE_RETRY_BASE = 5 * 60  # first retry after a failed check, doubled per failure
+UPDATE_RETRY_MAX = 12 * 60 * 60
+UPDATE_JITTER = 0.2  # +/- share of each delay, so clients don't check in lockstep
+
+# Performance panel
+PERF_HISTORY_SIZE = 600  # samples kept in the ring buffer
+PERF_DEFAULT_INTERVAL = 1000  # ms between samples
+
+# PDF export (QPdfWriter); margins, tab width and the fpdf fallback are in bunnypad_pdf.py
+PDF_RESOLUTION = 300
 
 if getattr(sys, 'frozen', False):
     # Running as a PyInstaller bundled executable
@@ -290,8 +333,9 @@ FILE_FILTERS = {
         "Text Files (*.txt);;Log Files (*.log);;Info files (*.nfo);;"
         "Batch files (*.bat);;Windows Command Script files (*.cmd);;"
         "VirtualBasicScript files (*.vbs);;JSON files (*.json);;"
-        "Python Source files (*.py);;All Supported File Types "
-        "(*.txt *.log *.nfo *.bat *.cmd *.vbs *.json *.py);;All Files (*.*)"
+        "Python Source files (*.py);;BunnyPad Encrypted Documents (*.bpenc);;"
+        "All Supported File Types "
+        "(*.txt *.log *.nfo *.bat *.cmd *.vbs *.json *.py *.bpenc);;All Files (*.*)"
     ),
     "save": (
         "Text Files (*.txt);;Log Files (*.log);;Info files (*.nfo);;"
@@ -299,10 +343,14 @@ FILE_FILTERS = {
         "VirtualBasicScript files (*.vbs);;JSON files (*.json);;All Files (*.*)"
     ),
     "pdf": "PDF File (*.pdf)",
+    "encrypted": "BunnyPad Encrypted Documents (*.bpenc)",
 }
 
 CHAR_MAP_DEFAULT_COLUMNS = 16
 CHAR_MAP_MIN_FONT_SIZE = 24
+# Recent/favorite strips; kept short on Android where the full grid is slow to repaint
+CHAR_MAP_RECENT_LIMIT = 16 if IS_ANDROID else 32
+CHAR_MAP_FAVORITES_LIMIT = 64
 
 # Logging
 log_filename = Path.home() / f"BunnyPad_update_log.{datetime.datetime.now().strftime('%Y-%m-%d_%H')}.log"
@@ -365,31 +413,13 @@ def load_stylesheet() -> str:
     return ""
 
 def parse_rccm_file(filepath):
+    """Load a binary v2 or legacy hex-JSON .rccm file; None if it can't be read."""
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            hexdata = f.read().strip()
-        decoded_json = bytes.fromhex(hexdata).decode("utf-8")
-        return json.loads(decoded_json)
+        return load_rccm(filepath)
     except Exception:
+        logger.exception("Failed to parse RCCM file %s", filepath)
         return None
 
-def save_as_pdf(text: str, file_path: str) -> bool:
-    """Save text as PDF using fpdf (if available)."""
-    if FPDF is None:
-        logger.error("FPDF not available.")
-        return False
-    try:
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", size=12)
-        for line in textwrap.wrap(text, width=180):
-            pdf.multi_cell(0, 6, txt=line)
-        pdf.output(file_path)
-        return True
-    except Exception:
-        logger.exception("Failed to save PDF")
-        return False
-
 def get_real_windows_build() -> tuple:
     """Get real Windows build numbers using RtlGetNtVersionNumbers (anti-spoofing)."""
     try:
@@ -484,7 +514,7 @@ def identify_os() -> str:
                     linux_name = distro.name(pretty=True)
                     linux_ver = distro.version(pretty=True)
                 else:
-                    linux_name = platform.platform()
+                    linux_name = linux_os_name() or platform.platform()
                     linux_ver = ""
                 return f"Linux {linux_name} {linux_ver} - Kernel: {platform.release()}"
             except Exception:
@@ -529,6 +559,11 @@ def identify_os() -> str:
 def get_cpu_model() -> str:
     """Get CPU model name with several fallbacks."""
     try:
+        if platform.system() == "Linux":
+            cpu = linux_cpu_model()
+            if cpu:
+                return cpu
+
         # Try platform module first (fastest)
         cpu = platform.processor()
         if cpu and cpu.strip():
@@ -557,8 +592,8 @@ def get_cpu_model() -> str:
                 lines = [l.strip() for l in res.stdout.splitlines() if l.strip()]
                 if len(lines) > 1:
                     return lines[1]
-        else:
-            # Linux/Unix - try lscpu with shorter timeout
+        elif platform.system() != "Linux":
+            # Other Unix - try lscpu with shorter timeout
             res = safe_subprocess_run(["lscpu"], shell=True, timeout=5)
             if res and res.stdout:
                 for ln in res.stdout.splitlines():
@@ -608,18 +643,10 @@ def get_gpu_info() -> str:
                 if names:
                     return ", ".join(names)
             return "Not available"
+        elif platform.system() == "Linux":
+            return ", ".join(linux_gpu_names()) or "Not available"
         else:
-            # Linux/Unix - try faster alternatives first
-            try:
-                # Try reading from /proc/cpuinfo first (fastest)
-                with open("/proc/cpuinfo", "r") as f:
-                    for line in f:
-                        if line.startswith("model name"):
-                            return line.split(":", 1)[1].strip()
-            except Exception:
-                pass
-            
-            # Fallback to subprocess commands with shorter timeout
+            # Other Unix - fall back to subprocess commands with shorter timeout
             res = safe_subprocess_run(["lshw", "-C", "display"], shell=True, timeout=5)
             if res and res.stdout:
                 for ln in res.stdout.splitlines():
@@ -636,40 +663,235 @@ def get_gpu_info() -> str:
         logger.exception("get_gpu_info failed")
         return "Not available"
 
-def get_system_info() -> str:
-    """Return assembled system info string."""
+def get_ram_info() -> str:
     try:
-        parts = []
-        parts.append(f"OS: {identify_os()}")
-        parts.append(f"CPU: {get_cpu_model()}")
+        if psutil:
+            return f"{psutil.virtual_memory().total / (1024 ** 3):.2f} GB"
+    except Exception:
+        pass
+    total = linux_mem_total() if platform.system() == "Linux" else None
+    if total:
+        return f"{total / (1024 ** 3):.2f} GB"
+    return "Unknown"
+
+def get_disk_info() -> str:
+    try:
+        total, used, free = shutil.disk_usage(os.path.abspath(os.sep))
+        return f"{total // (2 ** 30)} GB total, {free // (2 ** 30)} GB free"
+    except Exception:
+        return "Unknown"
+
+def get_screen_resolution() -> str:
+    """Primary screen size; GUI thread only."""
+    try:
+        screen = QGuiApplication.primaryScreen()
+        if screen:
+            rect = screen.geometry()
+            return f"{rect.width()}x{rect.height()}"
+    except Exception:
+        pass
+    return "Unknown"
+
+# (label, probe, cacheable) in display order. Cacheable results can't change
+# before the next reboot; free disk space can, so it is always probed.
+SYSINFO_PROBES = (
+    ("OS", identify_os, True),
+    ("CPU", get_cpu_model, True),
+    ("RAM", get_ram_info, True),
+    ("GPU", get_gpu_info, True),
+    ("Disk", get_disk_info, False),
+)
+
+def get_boot_id():
+    """An identifier for the current boot, or None where it can't be told."""
+    try:
+        with open("/proc/sys/kernel/random/boot_id", "r") as f:
+            return f.read().strip()
+    except OSError:
+        pass
+    try:
+        if psutil:
+            return f"boot-{int(psutil.boot_time())}"
+    except Exception:
+        pass
+    return None
+
+def load_sysinfo_cache() -> dict:
+    boot_id = get_boot_id()
+    if boot_id is None:
+        return {}
+    try:
+        with open(SYSINFO_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != SYSINFO_CACHE_VERSION or data.get("boot_id") != boot_id:
+        return {}
+    if not 0 <= time.time() - data.get("saved", 0) < SYSINFO_CACHE_TTL:
+        return {}
+    fields = data.get("fields")
+    return fields if isinstance(fields, dict) else {}
+
+def save_sysinfo_cache(fields: dict):
+    boot_id = get_boot_id()
+    if boot_id is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(SYSINFO_CACHE_FILE), exist_ok=True)
+        tmp_path = SYSINFO_CACHE_FILE + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": SYSINFO_CACHE_VERSION, "boot_id": boot_id, "saved": time.time(),
+                       "fields": fields}, f)
+        os.replace(tmp_path, SYSINFO_CACHE_FILE)
+    except OSError as e:
+        logger.warning("Could not cache system information: %s", e)
+
+def _run_probe(probe) -> str:
+    try:
+        return probe()
+    except Exception:
+        logger.exception("System probe %s failed", probe.__name__)
+        return "Unknown"
+
+def collect_system_info(on_result=None, use_cache=True) -> dict:
+    """Run every SYSINFO_PROBES entry at once on a thread pool; {label: value}.
+
+    `on_result(label, value)` is called as each value becomes known, cached ones
+    first. Fresh results of cacheable probes are saved for the rest of the boot.
+    """
+    cached = load_sysinfo_cache() if use_cache else {}
+    results = {}
+    with ThreadPoolExecutor(len(SYSINFO_PROBES)) as pool:
+        pending = {}
+        for label, probe, cacheable in SYSINFO_PROBES:
+            if cacheable and isinstance(cached.get(label), str):
+                results[label] = cached[label]
+                if on_result is not None:
+                    on_result(label, results[label])
+            else:
+                pending[pool.submit(_run_probe, probe)] = label
+        for future in as_completed(pending):
+            label = pending[future]
+            results[label] = future.result()
+            if on_result is not None:
+                on_result(label, results[label])
+    fresh = {label: results[label] for label, probe, cacheable in SYSINFO_PROBES if cacheable}
+    if fresh != {label: cached.get(label) for label in fresh}:
+        save_sysinfo_cache(fresh)
+    return results
+
+class ProcessSampler:
+    """Resource use of the BunnyPad process: psutil when installed, /proc/self otherwise.
+
+    sample() returns {"rss", "peak", "cpu", "threads", "handles"}; a value is None
+    where neither source can tell. "peak" is the process high-water mark reported
+    by the OS, not a maximum over the samples taken.
+    """
+
+    def __init__(self):
+        self.process = None
         try:
             if psutil:
-                ram = psutil.virtual_memory().total / (1024 ** 3)
-                parts.append(f"RAM: {ram:.2f} GB")
-            else:
-                parts.append("RAM: Unknown")
+                self.process = psutil.Process()
+                self.process.cpu_percent(None)  # the first reading only sets the baseline
         except Exception:
-            parts.append("RAM: Unknown")
-        parts.append(f"GPU: {get_gpu_info()}")
+            self.process = None
+        self._last_times = None  # (wall clock, CPU seconds) for the fallback CPU%
+
+    def sample(self) -> dict:
+        if self.process is not None:
+            try:
+                return self._sample_psutil()
+            except Exception:
+                logger.exception("psutil sampling failed; falling back to /proc/self")
+                self.process = None
+        return self._sample_proc()
+
+    def _sample_psutil(self) -> dict:
+        p = self.process
+        with p.oneshot():
+            handles = p.num_handles() if hasattr(p, "num_handles") else p.num_fds()
+            memory = p.memory_info()
+            peak = getattr(memory, "peak_wset", None)  # Windows only
+            return {"rss": memory.rss, "peak": peak if peak is not None else self._peak_rss(),
+                    "cpu": p.cpu_percent(None), "threads": p.num_threads(), "handles": handles}
+
+    @staticmethod
+    def _peak_rss():
+        """Peak resident set size in bytes from VmHWM or getrusage, or None."""
         try:
-            total, used, free = shutil.disk_usage(os.path.abspath(os.sep))
-            parts.append(f"Disk: {total // (2 ** 30)} GB total, {free // (2 ** 30)} GB free")
-        except Exception:
-            parts.append("Disk: Unknown")
+            with open("/proc/self/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
         try:
-            screen = QGuiApplication.primaryScreen()
-            if screen:
-                rect = screen.geometry()
-                parts.append(f"Screen Resolution: {rect.width()}x{rect.height()}")
-        except Exception:
-            parts.append("Screen Resolution: Unknown")
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except (ImportError, OSError, ValueError):
+            return None
+        return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KiB elsewhere
+
+    def _sample_proc(self) -> dict:
+        sample = {"rss": None, "peak": self._peak_rss(), "cpu": None, "threads": None, "handles": None}
+        try:
+            with open("/proc/self/statm", "r") as f:
+                sample["rss"] = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError, AttributeError):
+            pass
+        try:
+            with open("/proc/self/status", "r") as f:
+                for line in f:
+                    if line.startswith("Threads:"):
+                        sample["threads"] = int(line.split()[1])
+                        break
+        except (OSError, ValueError, IndexError):
+            pass
+        try:
+            sample["handles"] = len(os.listdir("/proc/self/fd"))
+        except OSError:
+            pass
+        times = os.times()
+        now, cpu = time.monotonic(), times.user + times.system
+        if self._last_times is not None and now > self._last_times[0]:
+            sample["cpu"] = (cpu - self._last_times[1]) / (now - self._last_times[0]) * 100
+        self._last_times = (now, cpu)
+        return sample
+
+def get_system_info() -> str:
+    """Return assembled system info string."""
+    try:
+        fields = collect_system_info()
+        parts = [f"{label}: {fields[label]}" for label, probe, cacheable in SYSINFO_PROBES]
+        parts.append(f"Screen Resolution: {get_screen_resolution()}")
         return "\n".join(parts)
     except Exception:
         logger.exception("get_system_info failed")
         return "System information not available"
 
+class SystemInfoCollector(QThread):
+    """Runs collect_system_info() off the GUI thread, emitting each field as it arrives."""
+    probed = Signal(str, str)  # label, value
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.results = {}  # what has been emitted so far, for dialogs opened mid-run
+
+    def run(self):
+        try:
+            collect_system_info(self._report)
+        except Exception:
+            logger.exception("System information collection failed")
+
+    def _report(self, label, value):
+        self.results[label] = value
+        self.probed.emit(label, value)
+
 class CharacterWidget(QWidget):
     characterSelected = Signal(str)
+    characterHovered = Signal(int)
+    favoriteToggled = Signal(str)
     closed = Signal()
 
     def __init__(self, parent=None, as_window=False):
@@ -696,7 +918,21 @@ class CharacterWidget(QWidget):
         self.current_range_name = "Basic Latin"
         self.start_codepoint, self.end_codepoint = self.unicode_ranges[self.current_range_name]
         self.total_characters = self.end_codepoint - self.start_codepoint + 1
-        self._last_tooltip_cp = None
+        self.codepoints = range(self.start_codepoint, self.end_codepoint + 1)
+        self.fixed_codepoints = None
+        self._hovered_cp = -1
+
+        # Hover hit-testing runs at most once per display frame, on the latest position
+        self._pending_hover_pos = None
+        self._hover_timer = QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.timeout.connect(self._process_hover)
+
+        # Font coverage (FontCoverage bitsets); None until the panel has indexed the font
+        self.coverage = None
+        self.show_covered_only = False
+        self.fallback_fonts = []
+        self._fallback_cache = {}
 
         if self._as_window:
             self.setFixedSize(self.sizeHint())
@@ -725,22 +961,60 @@ class CharacterWidget(QWidget):
         if name in self.unicode_ranges:
             self.current_range_name = name
             self.start_codepoint, self.end_codepoint = self.unicode_ranges[name]
-            self.total_characters = self.end_codepoint - self.start_codepoint + 1
             self.last_key = -1
-            self._last_tooltip_cp = None
-            self.updateGeometry()
-            self.update()
-            if self._as_window:
-                self.setFixedSize(self.sizeHint())
+            self._refresh_codepoints()
             return True
         return False
 
+    def set_font_coverage(self, font: QFont, coverage, fallbacks=()):
+        """Switch the display font; `fallbacks` is a list of (QFont, FontCoverage) for missing glyphs."""
+        self.display_font = QFont(font)
+        self.coverage = coverage
+        self.fallback_fonts = []
+        for fallback_font, cov in fallbacks:
+            fallback_font = QFont(fallback_font)
+            fallback_font.setBold(True)
+            self.fallback_fonts.append((fallback_font, cov))
+        self._fallback_cache = {}
+        self._refresh_codepoints()
+
+    def set_show_covered_only(self, enabled: bool):
+        self.show_covered_only = bool(enabled)
+        self._refresh_codepoints()
+
+    def fallback_font_for(self, cp: int):
+        """Return the first fallback font whose coverage bitset has `cp`, or None."""
+        if cp not in self._fallback_cache:
+            self._fallback_cache[cp] = next((f for f, cov in self.fallback_fonts if cp in cov), None)
+        return self._fallback_cache[cp]
+
+    def set_codepoints(self, codepoints):
+        """Show an explicit list of code points instead of a Unicode range."""
+        self.fixed_codepoints = list(codepoints)
+        self._refresh_codepoints()
+
+    def _refresh_codepoints(self):
+        if self.fixed_codepoints is not None:
+            self.codepoints = self.fixed_codepoints
+        elif self.show_covered_only and self.coverage is not None:
+            self.codepoints = self.coverage.codepoints(self.start_codepoint, self.end_codepoint)
+        else:
+            self.codepoints = range(self.start_codepoint, self.end_codepoint + 1)
+        self.total_characters = len(self.codepoints)
+        self._set_hovered(-1)
+        self.updateGeometry()
+        self.update()
+        if self._as_window:
+            self.setFixedSize(self.sizeHint())
+
     def get_codepoint_from_position(self, x: int, y: int) -> int:
         col = x // self.square_size
         row = y // self.square_size
+        if col >= self.columns:
+            return -1
         index = row * self.columns + col
         if 0 <= index < self.total_characters:
-            return self.start_codepoint + index
+            return self.codepoints[index]
         return -1
 
     def isValidCharacter(self, ch: str) -> bool:
@@ -752,25 +1026,31 @@ class CharacterWidget(QWidget):
             return False
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
-        pos = event.position().toPoint()  # PyQt6 uses position() returning QPointF
-        codepoint = self.get_codepoint_from_position(pos.x(), pos.y())
-        if codepoint == -1:
-            if self._last_tooltip_cp is not None:
-                QToolTip.hideText()
-                self._last_tooltip_cp = None
-            return
-        if codepoint == self._last_tooltip_cp:
+        self._pending_hover_pos = event.position().toPoint()  # PyQt6 uses position() returning QPointF
+        if not self._hover_timer.isActive():
+            screen = self.screen()
+            refresh_rate = screen.refreshRate() if screen else 60.0
+            self._hover_timer.start(max(1, int(1000 / max(refresh_rate, 1.0))))
+
+    def leaveEvent(self, event):
+        self._hover_timer.stop()
+        self._pending_hover_pos = None
+        self._set_hovered(-1)
+        super().leaveEvent(event)
+
+    def _process_hover(self):
+        pos = self._pending_hover_pos
+        if pos is None:
             return
-        self._last_tooltip_cp = codepoint
-        ch = self._chr(codepoint)
-        if self.isValidCharacter(ch):
-            tooltip_pos = self.mapToGlobal(pos)
-            text = (
-                f'<p>Character: <span style="font-size: 18pt; font-family:{self.display_font.family()}">'
-                f"{ch}</span></p><p>Value: 0x{codepoint:x} ({codepoint})</p>"
-                f"<p>Range: {self.current_range_name}</p>"
-            )
-            QToolTip.showText(tooltip_pos, text, self)
+        codepoint = self.get_codepoint_from_position(pos.x(), pos.y())
+        if codepoint != -1 and not self.isValidCharacter(self._chr(codepoint)):
+            codepoint = -1
+        self._set_hovered(codepoint)
+
+    def _set_hovered(self, codepoint: int):
+        if codepoint != self._hovered_cp:
+            self._hovered_cp = codepoint
+            self.characterHovered.emit(codepoint)
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         if event.button() == Qt.MouseButton.LeftButton:
@@ -782,6 +1062,11 @@ class CharacterWidget(QWidget):
                 if self.isValidCharacter(ch):
                     self.characterSelected.emit(ch)
                 self.update()
+        elif event.button() == Qt.MouseButton.RightButton:
+            pos = event.position().toPoint()
+            ch = self._chr(self.get_codepoint_from_position(pos.x(), pos.y()))
+            if self.isValidCharacter(ch):
+                self.favoriteToggled.emit(ch)
         else:
             super().mousePressEvent(event)
 
@@ -813,7 +1098,7 @@ class CharacterWidget(QWidget):
                 idx = row * self.columns + col
                 if idx >= self.total_characters:
                     continue
-                cp = self.start_codepoint + idx
+                cp = self.codepoints[idx]
                 ch = self._chr(cp)
                 if not ch:
                     continue
@@ -821,16 +1106,587 @@ class CharacterWidget(QWidget):
                 y = row * self.square_size
                 if cp == self.last_key:
                     painter.fillRect(x + 1, y + 1, self.square_size - 2, self.square_size - 2, QColor("#ffdddd"))
-                tw = fm.horizontalAdvance(ch)
-                th = fm.ascent()
+                cell_fm = fm
+                if self.coverage is not None and cp not in self.coverage:
+                    fallback = self.fallback_font_for(cp)
+                    if fallback is not None:
+                        painter.setFont(fallback)
+                        cell_fm = QFontMetrics(fallback)
+                    elif self.show_covered_only:
+                        continue
+                    # Otherwise draw with the display font and let Qt's own font fallback find a glyph
+                tw = cell_fm.horizontalAdvance(ch)
+                th = cell_fm.ascent()
                 tx = x + (self.square_size - tw) // 2
                 ty = y + (self.square_size + th) // 2 - 2
                 painter.drawText(tx, ty, ch)
+                if cell_fm is not fm:
+                    painter.setFont(font)
 
     def closeEvent(self, event):
         self.closed.emit()
         super().closeEvent(event)
 
+class CharacterPreview(QWidget):
+    """Hover preview for the character map: a large glyph, its name and encodings."""
+
+    GLYPH_PIXEL_SIZE = 48
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.codepoint = -1
+        self.glyph_font = QFont()
+        self.glyph_font.setPixelSize(self.GLYPH_PIXEL_SIZE)
+        self.setMinimumHeight(self.GLYPH_PIXEL_SIZE + 16)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def describe(cp: int) -> tuple:
+        """Return the (name, UTF-8, UTF-16) text lines for `cp`; cached across hovers."""
+        ch = chr(cp)
+        utf16 = ch.encode("utf-16-le")
+        return (
+            f"U+{cp:04X}  {unicodedata.name(ch, '<unnamed>')}",
+            "UTF-8:  " + " ".join(f"{b:02X}" for b in ch.encode("utf-8")),
+            "UTF-16: " + " ".join(f"{u:04X}" for u in struct.unpack(f"<{len(utf16) // 2}H", utf16)),
+        )
+
+    def set_codepoint(self, cp: int, font: QFont = None):
+        if font is not None and font.family() != self.glyph_font.family():
+            self.glyph_font = QFont(font)
+            self.glyph_font.setPixelSize(self.GLYPH_PIXEL_SIZE)
+        elif cp == self.codepoint:
+            return
+        self.codepoint = cp
+        self.update()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        if self.codepoint < 0:
+            return
+        painter = QPainter(self)
+        painter.setPen(self.palette().windowText().color())
+        box = self.height()
+        painter.setFont(self.glyph_font)
+        painter.drawText(QRect(0, 0, box, box), Qt.AlignmentFlag.AlignCenter, chr(self.codepoint))
+
+        painter.setFont(self.font())
+        fm = QFontMetrics(self.font())
+        x = box + 8
+        y = (box - 3 * fm.lineSpacing()) // 2 + fm.ascent()
+        for line in self.describe(self.codepoint):
+            painter.drawText(x, y, fm.elidedText(line, Qt.TextElideMode.ElideRight, max(0, self.width() - x)))
+            y += fm.lineSpacing()
+
+class CharacterStrip(QWidget):
+    """Recently used and favorite characters, persisted through QSettings."""
+
+    characterSelected = Signal(str)
+
+    RECENT_KEY = "CharacterMap/recent"
+    FAVORITES_KEY = "CharacterMap/favorites"
+    SAVE_DELAY_MS = 2000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.settings = QSettings()
+        self.recent = deque(self._load(self.RECENT_KEY), maxlen=CHAR_MAP_RECENT_LIMIT)
+        self.favorites = deque(self._load(self.FAVORITES_KEY))  # never trimmed behind the user's back
+
+        # Changes only mark the lists dirty; one QSettings write per SAVE_DELAY_MS at most
+        self._dirty = False
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.flush)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+
+        self.recent_map = CharacterWidget(self)
+        self.favorites_map = CharacterWidget(self)
+        for strip in (self.recent_map, self.favorites_map):
+            strip.characterSelected.connect(self.characterSelected)
+            strip.favoriteToggled.connect(self.toggle_favorite)
+        self.recent_map.set_codepoints(self.recent)
+        self.favorites_map.set_codepoints(self.favorites)
+
+        layout = QFormLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addRow(QLabel(self.tr("Recent:")), self.recent_map)
+        layout.addRow(QLabel(self.tr("Favorites:")), self.favorites_map)
+        self.setToolTip(self.tr("Right-click a character to add or remove it from favorites"))
+
+    def _load(self, key: str) -> list:
+        try:
+            return [ord(ch) for ch in self.settings.value(key, "", type=str)]
+        except Exception:
+            logger.exception("Failed to load %s", key)
+            return []
+
+    def add_recent(self, ch: str):
+        cp = ord(ch)
+        if self.recent and self.recent[0] == cp:
+            return
+        if cp in self.recent:
+            self.recent.remove(cp)
+        self.recent.appendleft(cp)
+        self.recent_map.set_codepoints(self.recent)
+        self._schedule_save()
+
+    def toggle_favorite(self, ch: str):
+        cp = ord(ch)
+        if cp in self.favorites:
+            self.favorites.remove(cp)
+        elif len(self.favorites) >= CHAR_MAP_FAVORITES_LIMIT:
+            QMessageBox.information(self, self.tr("Favorites"),
+                                    self.tr("You can keep up to %d favorites. Right-click one to remove it first.")
+                                    % CHAR_MAP_FAVORITES_LIMIT)
+            return
+        else:
+            self.favorites.appendleft(cp)
+        self.favorites_map.set_codepoints(self.favorites)
+        self._schedule_save()
+
+    def set_display_font(self, font: QFont):
+        for strip in (self.recent_map, self.favorites_map):
+            strip.set_font_coverage(font, None)
+
+    def _schedule_save(self):
+        self._dirty = True
+        if not self._save_timer.isActive():
+            self._save_timer.start()
+
+    def flush(self):
+        if not self._dirty:
+            return
+        self._save_timer.stop()
+        self.settings.setValue(self.RECENT_KEY, "".join(map(chr, self.recent)))
+        self.settings.setValue(self.FAVORITES_KEY, "".join(map(chr, self.favorites)))
+        self._dirty = False
+
+class UnicodeNameIndex:
+    """Token/prefix index over unicodedata.name, cached per Unicode database version."""
+
+    CACHE_MAGIC = b"BPUNI1\n"
+    MAX_RESULTS = 256
+
+    def __init__(self):
+        self.tokens = []
+        self.offsets = array("I", [0])
+        self.postings = array("I")
+
+    @staticmethod
+    def cache_path() -> str:
+        return os.path.join(BUNNYPAD_CACHE, f"unicode-names-{unicodedata.unidata_version}.idx")
+
+    @classmethod
+    def load_or_build(cls):
+        index = cls()
+        path = cls.cache_path()
+        if index.load(path):
+            return index
+        index.build()
+        try:
+            index.save(path)
+        except OSError as e:
+            logger.warning("Could not cache Unicode name index: %s", e)
+        return index
+
+    @staticmethod
+    def _tokenize(name: str, cp: int) -> set:
+        # Ideograph names end in their own code point ("CJK UNIFIED IDEOGRAPH-4E00");
+        # the hex lookup already covers those, so keep them out of the token table.
+        suffix = f"-{cp:04X}"
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+        return set(name.split()) | set(name.replace("-", " ").split())
+
+    def build(self):
+        postings = {}
+        for cp in range(sys.maxunicode + 1):
+            name = unicodedata.name(chr(cp), "")
+            if not name:
+                continue
+            for token in self._tokenize(name, cp):
+                postings.setdefault(token, []).append(cp)
+        self.tokens = sorted(postings)
+        self.offsets = array("I", [0])
+        self.postings = array("I")
+        for token in self.tokens:
+            self.postings.extend(postings[token])
+            self.offsets.append(len(self.postings))
+
+    def save(self, path: str):
+        token_blob = "\n".join(self.tokens).encode("ascii")
+        offsets, postings = array("I", self.offsets), array("I", self.postings)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+            postings.byteswap()
+        body = (
+            struct.pack("<III", len(token_blob), len(offsets), len(postings))
+            + token_blob + offsets.tobytes() + postings.tobytes()
+        )
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.CACHE_MAGIC)
+            f.write(zlib.compress(body, 6))
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> bool:
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(self.CACHE_MAGIC)) != self.CACHE_MAGIC:
+                    return False
+                body = zlib.decompress(f.read())
+            blob_len, n_offsets, n_postings = struct.unpack_from("<III", body)
+            pos = struct.calcsize("<III")
+            tokens = body[pos:pos + blob_len].decode("ascii").split("\n")
+            pos += blob_len
+            offsets = array("I")
+            offsets.frombytes(body[pos:pos + n_offsets * offsets.itemsize])
+            pos += n_offsets * offsets.itemsize
+            postings = array("I")
+            postings.frombytes(body[pos:pos + n_postings * postings.itemsize])
+            if sys.byteorder == "big":
+                offsets.byteswap()
+                postings.byteswap()
+            if len(offsets) != len(tokens) + 1 or offsets[-1] != len(postings):
+                return False
+        except (OSError, ValueError, struct.error, zlib.error):
+            return False
+        self.tokens, self.offsets, self.postings = tokens, offsets, postings
+        return True
+
+    @staticmethod
+    def parse_codepoint(query: str):
+        """Return the code point for "U+2192", "0x2192" or "2192", else None."""
+        text = query.strip().upper()
+        for prefix in ("U+", "0X"):
+            if text.startswith(prefix):
+                text = text[len(prefix):]
+                break
+        if not 1 <= len(text) <= 6:
+            return None
+        try:
+            cp = int(text, 16)
+        except ValueError:
+            return None
+        if cp > sys.maxunicode or 0xD800 <= cp <= 0xDFFF:
+            return None
+        return cp
+
+    def _prefix_postings(self, prefix: str) -> set:
+        lo = bisect.bisect_left(self.tokens, prefix)
+        hi = bisect.bisect_left(self.tokens, prefix + "\uffff", lo)
+        found = set()
+        for i in range(lo, hi):
+            found.update(self.postings[self.offsets[i]:self.offsets[i + 1]])
+        return found
+
+    def search(self, query: str, limit: int = MAX_RESULTS) -> list:
+        """Return code points whose name has a token starting with every query word."""
+        results = []
+        cp = self.parse_codepoint(query)
+        if cp is not None:
+            results.append(cp)
+        words = query.upper().replace("-", " ").split()
+        if not words or not self.tokens:
+            return results
+        matches = None
+        # Longest words first: they usually match the fewest code points.
+        for word in sorted(words, key=len, reverse=True):
+            found = self._prefix_postings(word)
+            matches = found if matches is None else matches & found
+            if not matches:
+                break
+        if matches:
+            matches.discard(cp)
+            results.extend(sorted(matches)[:max(0, limit - len(results))])
+        return results
+
+class UnicodeIndexLoader(QThread):
+    index_ready = Signal(object)
+
+    def run(self):
+        try:
+            index = UnicodeNameIndex.load_or_build()
+        except Exception:
+            logger.exception("Failed to build Unicode name index")
+            index = UnicodeNameIndex()
+        self.index_ready.emit(index)
+
+class FontCoverage:
+    """Bitset of the code points a font family can render, cached on disk per family.
+
+    The cache header records which font file the family resolved to (see
+    font_stamp), so an updated or replaced font is indexed again.
+    """
+
+    CACHE_MAGIC = b"BPFC2\n"
+    # Planes 4-13 and 15-16 are unassigned or private use; skip them when probing.
+    PROBE_RANGES = (range(0x0000, 0x40000), range(0xE0000, 0xE0200))
+
+    def __init__(self, family: str, bits: bytearray = None, stamp: str = ""):
+        self.family = family
+        self.stamp = stamp
+        self.bits = bits if bits is not None else bytearray((sys.maxunicode >> 3) + 1)
+
+    def __contains__(self, cp: int) -> bool:
+        return 0 <= cp <= sys.maxunicode and bool(self.bits[cp >> 3] & (1 << (cp & 7)))
+
+    def codepoints(self, start: int, end: int) -> list:
+        return [cp for cp in range(start, end + 1) if cp in self]
+
+    @staticmethod
+    def cache_path(family: str) -> str:
+        digest = hashlib.sha1(family.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(BUNNYPAD_CACHE, f"coverage-{digest}.bin")
+
+    @staticmethod
+    def font_stamp(family: str) -> str:
+        """Identity of the font file behind `family`.
+
+        The resolved file with its size and mtime where fontconfig can name it,
+        plus the revision, checksum and modified date from the font's 'head'
+        table, which Qt gives on every platform.
+        """
+        parts = []
+        if shutil.which("fc-match"):
+            res = safe_subprocess_run(["fc-match", "-f", "%{file}", family], timeout=5)
+            path = res.stdout.strip() if res is not None and res.returncode == 0 else ""
+            try:
+                st = os.stat(path)
+                parts.append(f"{path}:{st.st_size}:{st.st_mtime_ns}")
+            except OSError:
+                pass
+        head = bytes(QRawFont.fromFont(QFont(family)).fontTable("head"))
+        parts.append(head[4:12].hex() + head[28:36].hex())  # fontRevision and checkSumAdjustment, then the modified date
+        return "|".join(parts)
+
+    @classmethod
+    def load_or_compute(cls, family: str):
+        stamp = cls.font_stamp(family)
+        coverage = cls.load(family, stamp)
+        if coverage is not None:
+            return coverage
+        coverage = cls.compute(family, stamp)
+        try:
+            coverage.save()
+        except OSError as e:
+            logger.warning("Could not cache font coverage for %s: %s", family, e)
+        return coverage
+
+    @classmethod
+    def compute(cls, family: str, stamp: str = ""):
+        coverage = cls(family, stamp=stamp)
+        raw = QRawFont.fromFont(QFont(family))
+        if not raw.isValid():
+            return coverage
+        bits = coverage.bits
+        supports = raw.supportsCharacter
+        for probe_range in cls.PROBE_RANGES:
+            for cp in probe_range:
+                if 0xD800 <= cp <= 0xDFFF:
+                    continue
+                if supports(cp):
+                    bits[cp >> 3] |= 1 << (cp & 7)
+        return coverage
+
+    def save(self):
+        path = self.cache_path(self.family)
+        header = b"".join(struct.pack("<H", len(field)) + field
+                          for field in (self.family.encode("utf-8"), self.stamp.encode("utf-8")))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.CACHE_MAGIC)
+            f.write(zlib.compress(header + bytes(self.bits), 6))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, family: str, stamp: str):
+        """The cached bitset, or None if there is none or it is for another font file."""
+        try:
+            with open(cls.cache_path(family), "rb") as f:
+                if f.read(len(cls.CACHE_MAGIC)) != cls.CACHE_MAGIC:
+                    return None
+                body = zlib.decompress(f.read())
+            offset, fields = 0, []
+            for _ in range(2):  # family, font stamp
+                (length,) = struct.unpack_from("<H", body, offset)
+                fields.append(body[offset + 2:offset + 2 + length].decode("utf-8"))
+                offset += 2 + length
+            if fields != [family, stamp]:
+                return None
+            bits = bytearray(body[offset:])
+        except (OSError, ValueError, struct.error, zlib.error):
+            return None
+        if len(bits) != (sys.maxunicode >> 3) + 1:
+            return None
+        return cls(family, bits, stamp)
+
+class FontCoverageLoader(QThread):
+    coverage_ready = Signal(str, object)
+
+    def __init__(self, family: str, parent=None):
+        super().__init__(parent)
+        self.family = family
+
+    def run(self):
+        try:
+            coverage = FontCoverage.load_or_compute(self.family)
+        except Exception:
+            logger.exception("Failed to index font coverage for %s", self.family)
+            coverage = None
+        self.coverage_ready.emit(self.family, coverage)
+
+class CharacterMapPanel(QWidget):
+    """Character Map dock contents: name/hex search above the CharacterWidget grid."""
+
+    characterSelected = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_index = None
+        self._index_loader = None
+        self.font_coverage = {}
+        self._coverage_loaders = {}
+
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText(self.tr("Search by name or hex value (e.g. ARROW, U+2192)"))
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self.run_search)
+
+        self.results_list = QListWidget()
+        self.results_list.itemClicked.connect(self._on_result_clicked)
+        self.results_list.hide()
+
+        self.character_map = CharacterWidget(self)
+        self.character_map.characterSelected.connect(self.characterSelected)
+
+        self.preview = CharacterPreview(self)
+        self.character_map.characterHovered.connect(self._on_character_hovered)
+
+        self.strip = CharacterStrip(self)
+        self.strip.characterSelected.connect(self.characterSelected)
+        self.character_map.favoriteToggled.connect(self.strip.toggle_favorite)
+        self.characterSelected.connect(self.strip.add_recent)
+
+        self.range_combo = QComboBox()
+        self.range_combo.addItems(list(self.character_map.unicode_ranges))
+        self.range_combo.setCurrentText(self.character_map.current_range_name)
+        self.range_combo.currentTextChanged.connect(self.character_map.set_unicode_range)
+
+        self.font_combo = QFontComboBox()
+        self.font_combo.setCurrentFont(self.character_map.display_font)
+        self.font_combo.currentFontChanged.connect(self.set_display_font)
+
+        self.covered_only_check = QCheckBox(self.tr("Show only glyphs this font has"))
+        self.covered_only_check.toggled.connect(self.character_map.set_show_covered_only)
+
+        font_row = QHBoxLayout()
+        font_row.addWidget(self.range_combo)
+        font_row.addWidget(self.font_combo, 1)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.search_box)
+        layout.addWidget(self.results_list)
+        layout.addLayout(font_row)
+        layout.addWidget(self.covered_only_check)
+        layout.addWidget(self.strip)
+        layout.addWidget(self.character_map)
+        layout.addWidget(self.preview)
+        layout.addStretch(1)
+        self._apply_font(self.font_combo.currentFont().family())
+
+    def showEvent(self, event):
+        self.ensure_index()
+        self.request_coverage(self.font_combo.currentFont().family())
+        super().showEvent(event)
+
+    def set_display_font(self, font: QFont):
+        self._apply_font(font.family())
+        self.request_coverage(font.family())
+
+    def _apply_font(self, family: str):
+        fallbacks = [(QFont(name), cov) for name, cov in self.font_coverage.items() if name != family]
+        self.character_map.set_font_coverage(QFont(family), self.font_coverage.get(family), fallbacks)
+        self.strip.set_display_font(QFont(family))
+
+    def request_coverage(self, family: str):
+        """Index `family` on a worker thread unless it's already known or in flight."""
+        if family in self.font_coverage or family in self._coverage_loaders:
+            return
+        loader = FontCoverageLoader(family, self)
+        loader.coverage_ready.connect(self._on_coverage_ready)
+        self._coverage_loaders[family] = loader
+        loader.start()
+
+    def _on_character_hovered(self, cp: int):
+        font = self.character_map.display_font
+        coverage = self.character_map.coverage
+        if cp >= 0 and coverage is not None and cp not in coverage:
+            font = self.character_map.fallback_font_for(cp) or font
+        self.preview.set_codepoint(cp, font)
+
+    def _on_coverage_ready(self, family: str, coverage):
+        self._coverage_loaders.pop(family, None)
+        if coverage is None:
+            return
+        self.font_coverage[family] = coverage
+        # A new bitset is either the current font's or a new fallback; both change the grid
+        self._apply_font(self.font_combo.currentFont().family())
+
+    def ensure_index(self):
+        """Load (or build) the name index in the background the first time it's needed."""
+        if self.name_index is not None or self._index_loader is not None:
+            return
+        self._index_loader = UnicodeIndexLoader(self)
+        self._index_loader.index_ready.connect(self._on_index_ready)
+        self._index_loader.start()
+
+    def _on_index_ready(self, index):
+        self.name_index = index
+        self.run_search(self.search_box.text())
+
+    def run_search(self, text: str):
+        self.results_list.clear()
+        query = text.strip()
+        if not query:
+            self.results_list.hide()
+            return
+        self.results_list.show()
+        if self.name_index is None:
+            self.ensure_index()
+            cp = UnicodeNameIndex.parse_codepoint(query)
+            codepoints = [cp] if cp is not None else []
+        else:
+            codepoints = self.name_index.search(query)
+        for cp in codepoints:
+            ch = chr(cp)
+            name = unicodedata.name(ch, "")
+            item = QListWidgetItem(f"{ch}\tU+{cp:04X}\t{name}")
+            item.setData(Qt.ItemDataRole.UserRole, cp)
+            self.results_list.addItem(item)
+        if self.name_index is None:
+            placeholder = QListWidgetItem(self.tr("Building character name index..."))
+            placeholder.setFlags(Qt.ItemFlag.NoItemFlags)
+            self.results_list.addItem(placeholder)
+        elif not codepoints:
+            placeholder = QListWidgetItem(self.tr("No matching characters"))
+            placeholder.setFlags(Qt.ItemFlag.NoItemFlags)
+            self.results_list.addItem(placeholder)
+
+    def _on_result_clicked(self, item: QListWidgetItem):
+        cp = item.data(Qt.ItemDataRole.UserRole)
+        if cp is None:
+            return
+        ch = chr(cp)
+        if self.character_map.isValidCharacter(ch):
+            self.characterSelected.emit(ch)
+
 # --------------------
 # Dialog classes (preserve original behavior/easter eggs)
 # --------------------
@@ -1024,12 +1880,14 @@ class SystemInfoDialog(QDialog):
         layout.addWidget(logo)
 
         # Add system information as individual labels like CreditsDialog
+        self.field_labels = {}
         if self.system_info_text:
             info_lines = self.system_info_text.split('\n')
             for line in info_lines:
                 if line.strip():
                     info_label = QLabel(line.strip())
                     layout.addWidget(info_label)
+                    self.field_labels[line.split(":", 1)[0].strip()] = info_label
 
         # Add OS and directory info like CreditsDialog
         layout.addWidget(QLabel(self.tr("Installation Directory: ") + self.current_dir))
@@ -1059,6 +1917,118 @@ class SystemInfoDialog(QDialog):
             except Exception:
                 pass
 
+    def set_field(self, label: str, value: str):
+        """Fill in one "Label: value" line, e.g. as SystemInfoCollector reports it."""
+        if label == "OS":
+            self.display_os = value
+        info_label = self.field_labels.get(label)
+        if info_label is not None:
+            info_label.setText(f"{label}: {value}")
+
+class HistoryGraph(QWidget):
+    """Sparkline of one field over a ring buffer of samples, newest on the right."""
+
+    def __init__(self, history, field, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.field = field
+        self.setMinimumSize(240, 60)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        values = [sample[self.field] for sample in self.history if sample.get(self.field) is not None]
+        if len(values) < 2:
+            return
+        painter = QPainter(self)
+        low, high = min(values), max(values)
+        span = (high - low) or 1
+        width, height = self.width(), self.height()
+        step = width / max(1, self.history.maxlen - 1)
+        left = width - step * (len(values) - 1)
+        points = [QPointF(left + i * step, height - 1 - (value - low) / span * (height - 2))
+                  for i, value in enumerate(values)]
+        painter.setPen(self.palette().highlight().color())
+        painter.drawPolyline(QPolygonF(points))
+        painter.end()
+
+class PerformanceDialog(QDialog):
+    """Non-modal live view of BunnyPad's own resource use and of the open document.
+
+    Samples are taken on a QTimer while the panel is visible and kept in a
+    fixed-size ring buffer (PERF_HISTORY_SIZE), so memory growth during an edit
+    can be watched without attaching outside tools.
+    """
+
+    FIELDS = (
+        ("rss", "Memory (RSS)"),
+        ("peak", "Peak RSS"),
+        ("cpu", "CPU"),
+        ("threads", "Threads"),
+        ("handles", "Open handles"),
+        ("blocks", "Document blocks"),
+        ("undo", "Undo steps"),
+    )
+
+    def __init__(self, document, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(self.tr("Performance"))
+        self.setWindowIcon(QIcon(get_icon_path("bunnypad")))
+        self.setModal(False)
+        self.document = document
+        self.sampler = ProcessSampler()
+        self.history = deque(maxlen=PERF_HISTORY_SIZE)
+
+        layout = QFormLayout(self)
+        self.value_labels = {}
+        for field, title in self.FIELDS:
+            self.value_labels[field] = QLabel("-")
+            layout.addRow(self.tr(title) + ":", self.value_labels[field])
+        self.graph = HistoryGraph(self.history, "rss")
+        layout.addRow(self.tr("RSS history:"), self.graph)
+
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(100, 60000)
+        self.interval_spin.setSingleStep(100)
+        self.interval_spin.setSuffix(" ms")
+        self.interval_spin.setValue(QSettings().value("Performance/interval", PERF_DEFAULT_INTERVAL, type=int))
+        self.interval_spin.valueChanged.connect(self.set_interval)
+        layout.addRow(self.tr("Sample every:"), self.interval_spin)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.interval_spin.value())
+        self.timer.timeout.connect(self.take_sample)
+
+    def set_interval(self, msec):
+        self.timer.setInterval(msec)
+        QSettings().setValue("Performance/interval", msec)
+
+    def take_sample(self):
+        sample = self.sampler.sample()
+        sample["blocks"] = self.document.blockCount()
+        sample["undo"] = self.document.availableUndoSteps()
+        self.history.append(sample)
+        for field, label in self.value_labels.items():
+            label.setText(self.format_value(field, sample[field]))
+        self.graph.update()
+
+    @staticmethod
+    def format_value(field, value) -> str:
+        if value is None:
+            return "n/a"
+        if field in ("rss", "peak"):
+            return f"{value / (1024 ** 2):.1f} MB"
+        if field == "cpu":
+            return f"{value:.1f}%"
+        return f"{value:,}"
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.take_sample()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
 class CreditsDialog(QDialog):
     
     def __init__(self, *args, **kwargs):
@@ -1346,6 +2316,60 @@ class DownloadOptions(QDialog):
     def on_join_our_discord_clicked(self):
         webbrowser.open("https://discord.gg/w7ls")
 
+class PdfRangeDialog(QDialog):
+    """Asks what Print to PDF should export: everything, the selection, or a page range."""
+
+    def __init__(self, has_selection, allow_pages, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(self.tr("Print to PDF"))
+        self.setWindowIcon(QIcon(get_icon_path("pdf")))
+        layout = QFormLayout(self)
+
+        self.range_combo = QComboBox()
+        self.range_combo.addItem(self.tr("All pages"), "all")
+        if has_selection:
+            self.range_combo.addItem(self.tr("Selection only"), "selection")
+        if allow_pages:
+            self.range_combo.addItem(self.tr("Pages"), "pages")
+        layout.addRow(self.tr("Export:"), self.range_combo)
+
+        self.from_spin = QSpinBox()
+        self.to_spin = QSpinBox()
+        for spin in (self.from_spin, self.to_spin):
+            spin.setRange(1, 99999)
+        pages_row = QHBoxLayout()
+        pages_row.addWidget(self.from_spin)
+        pages_row.addWidget(QLabel(self.tr("to")))
+        pages_row.addWidget(self.to_spin)
+        layout.addRow(self.tr("Pages:"), pages_row)
+        self.range_combo.currentIndexChanged.connect(self.update_pages_enabled)
+        self.from_spin.valueChanged.connect(lambda value: self.to_spin.setValue(max(value, self.to_spin.value())))
+        self.update_pages_enabled()
+
+        buttons = QHBoxLayout()
+        ok_button = QPushButton(self.tr("OK"))
+        ok_button.setDefault(True)
+        ok_button.clicked.connect(self.accept)
+        cancel_button = QPushButton(self.tr("Cancel"))
+        cancel_button.clicked.connect(self.reject)
+        buttons.addStretch()
+        buttons.addWidget(ok_button)
+        buttons.addWidget(cancel_button)
+        layout.addRow(buttons)
+
+    def update_pages_enabled(self):
+        enabled = self.range_combo.currentData() == "pages"
+        self.from_spin.setEnabled(enabled)
+        self.to_spin.setEnabled(enabled)
+
+    def selection_only(self) -> bool:
+        return self.range_combo.currentData() == "selection"
+
+    def page_range(self):
+        if self.range_combo.currentData() != "pages":
+            return None
+        return self.from_spin.value(), max(self.from_spin.value(), self.to_spin.value())
+
 class alan_walker_wia_egg(QDialog):
     
     def __init__(self, parent=None):
@@ -1394,160 +2418,564 @@ class update_checker(QThread):
     update_check_completed = Signal(dict)
 
     
-    def __init__(self, repo_owner=REPO_OWNER, repo_name=REPO_NAME, use_pre_release=False):
+    def __init__(self, repo_owner=REPO_OWNER, repo_name=REPO_NAME, use_pre_release=False,
+                 api_base=GITHUB_API, state_path=UPDATE_STATE_FILE):
         super().__init__()
         self.repo_owner = repo_owner
         self.repo_name = repo_name
         self.use_pre_release = use_pre_release
+        self.api_base = api_base
+        self.state_path = state_path
+        self.status = None
 
     
     def run(self):
-        info = {}
         if requests is None:
             self.update_check_completed.emit({})
             return
         try:
-            url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/releases"
-            resp = requests.get(url, timeout=15)
-            resp.raise_for_status()
-            releases = resp.json()
-            latest_stable = None
-            latest_prerelease = None
-            for r in releases:
-                if r.get("prerelease", False):
-                    if latest_prerelease is None or (r.get("published_at") or "") > (latest_prerelease.get("published_at") or ""):
-                        latest_prerelease = r
-                else:
-                    if latest_stable is None or (r.get("published_at") or "") > (latest_stable.get("published_at") or ""):
-                        latest_stable = r
-            if latest_stable:
-                info["stable"] = {"version": latest_stable.get("tag_name"), "url": latest_stable.get("html_url"), "date": latest_stable.get("published_at")}
-            if latest_prerelease:
-                info["prerelease"] = {"version": latest_prerelease.get("tag_name"), "url": latest_prerelease.get("html_url"), "date": latest_prerelease.get("published_at")}
+            info, self.status = fetch_release_info(self.repo_owner, self.repo_name, self.use_pre_release,
+                                                   self.api_base, self.state_path, f"{APP_NAME}/{CURRENT_VERSION}")
             self.update_check_completed.emit(info)
         except Exception:
             logger.exception("Update check failed")
             self.update_check_completed.emit({})
 
+VERSION_PATTERN = re.compile(r"(\d+(?:\.\d+)*)(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]*)?$")
+
+def parse_version(tag):
+    """Sort key for a release tag, or None if it has no version number in it.
+
+    Handles both "v11.0.27000.0915" and FPL1's "v11.1.002": the numeric parts
+    compare as integers, missing trailing parts count as 0, and a pre-release
+    suffix ("-beta.2") sorts before the release itself, as in semver. The
+    "-dirty" of a local build and "+build" metadata are ignored.
+    """
+    match = VERSION_PATTERN.search((tag or "").strip())
+    if not match:
+        return None
+    numbers = [int(part) for part in match.group(1).split(".")]
+    while len(numbers) > 1 and numbers[-1] == 0:
+        numbers.pop()
+    suffix = match.group(2)
+    if suffix and suffix.lower() != "dirty":
+        pre = tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in suffix.split("."))
+        return tuple(numbers), 0, pre
+    return tuple(numbers), 1, ()
+
+def is_newer_version(tag, current=CURRENT_VERSION) -> bool:
+    new, old = parse_version(tag), parse_version(current)
+    if new is None or old is None:
+        logger.warning("Cannot compare versions %r and %r", tag, current)
+        return False
+    return new > old
+
+def newer_release(release_info: dict, current=CURRENT_VERSION):
+    """The newest release in update_checker's result that is newer than `current`."""
+    candidates = [r for r in release_info.values() if is_newer_version(r.get("version"), current)]
+    return max(candidates, key=lambda r: parse_version(r["version"]), default=None)
+
+def jittered(seconds, jitter=UPDATE_JITTER):
+    return seconds * random.uniform(1 - jitter, 1 + jitter)
+
+class UpdateScheduler(QObject):
+    """Runs update_checker in the background: once startup has settled, then daily.
+
+    Failed checks are retried with exponential backoff, and every delay gets
+    random jitter. The time of the last good check lives in QSettings, so
+    restarting BunnyPad does not check again before the interval is up.
+    """
+    update_available = Signal(dict)
+
+    def __init__(self, parent=None, interval=UPDATE_CHECK_INTERVAL):
+        super().__init__(parent)
+        self.interval = interval
+        self.failures = 0
+        self.enabled = False
+        self.checker = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.run_check)
+
+    def start(self):
+        if requests is None:
+            return
+        self.enabled = True
+        last = QSettings().value("Updates/last_check", 0.0, type=float)
+        due = last + self.interval - time.time()
+        self.schedule(min(max(due, UPDATE_STARTUP_DELAY), self.interval))  # clamp in case the clock moved
+
+    def stop(self):
+        """Stop scheduling checks; a check already running finishes unheard."""
+        self.enabled = False
+        self.timer.stop()
+        if self.checker is not None:
+            try:
+                self.checker.update_check_completed.disconnect(self.on_check_completed)
+            except (TypeError, RuntimeError):
+                pass  # already disconnected
+
+    def wait(self):
+        """Block until a running check has finished; only for shutdown."""
+        if self.checker is not None:
+            self.checker.wait()
+
+    def schedule(self, seconds):
+        delay = jittered(seconds)
+        logger.debug("Next update check in %.0f s", delay)
+        self.timer.start(int(delay * 1000))
+
+    def run_check(self):
+        if self.checker is not None and self.checker.isRunning():
+            # one left over from before a stop(); its result is no longer connected
+            self.schedule(UPDATE_RETRY_BASE)
+            return
+        self.checker = update_checker(REPO_OWNER, REPO_NAME, False)
+        self.checker.update_check_completed.connect(self.on_check_completed)
+        self.checker.start()
+
+    def on_check_completed(self, release_info: dict):
+        if not self.enabled:
+            return  # queued before stop() disconnected the checker
+        if self.checker.status is None:
+            self.failures += 1
+            self.schedule(min(UPDATE_RETRY_BASE * 2 ** (self.failures - 1), UPDATE_RETRY_MAX))
+            return
+        self.failures = 0
+        settings = QSettings()
+        settings.setValue("Updates/last_check", time.time())
+        self.schedule(self.interval)
+        release = newer_release(release_info)
+        # Tell the user about each new version once, not once a day
+        if release and settings.value("Updates/notified") != release["version"]:
+            settings.setValue("Updates/notified", release["version"])
+            self.update_available.emit(release)
+
 # --------------------
-# Cryptography Engine
+# Cryptography worker
 # --------------------
-class CryptoEngine:
-    def __init__(self):
-        self.german_marker = GERMAN_MARKER
-        self.german_words = GERMAN_WORDS.copy()
+class CryptoWorker(QThread):
+    """Runs an encrypt/decrypt pipeline off the GUI thread.
+
+    The stages are streamed together chunk by chunk, so progress is the share of
+    input that has passed through every stage. Cancellation is checked between chunks.
+    """
+    progress = Signal(int)
+    completed = Signal(str, object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, engine, mode, text, shift, key, interval, verbose=False):
+        super().__init__()
+        self.engine = engine
+        self.mode = mode
+        self.text = text
+        self.shift = shift
+        self.key = key
+        self.interval = interval
+        self.stages = StageLog(CRYPTO_DEBUG_PREVIEW) if verbose else None
+
+    def _chunks(self):
+        total = max(1, len(self.text))
+        done = 0
+        last = -1
+        for chunk in iter_text_chunks(self.text):
+            if self.isInterruptionRequested():
+                return
+            yield chunk
+            done += len(chunk)
+            percent = done * 100 // total
+            if percent != last:
+                last = percent
+                self.progress.emit(percent)
 
-    # ---- Caesar ----
-    @staticmethod
-    def caesar_cipher(text, shift):
-        result = ""
-        for char in text:
-            if char.isalpha():
-                offset = 65 if char.isupper() else 97
-                result += chr((ord(char) - offset + shift) % 26 + offset)
+    def run(self):
+        stream = self.engine.encrypt_stream if self.mode == "encrypt" else self.engine.decrypt_stream
+        parts = []
+        try:
+            for piece in stream(self._chunks(), self.shift, self.key, self.interval, self.stages):
+                if self.isInterruptionRequested():
+                    break
+                parts.append(piece)
+        except Exception as e:
+            if self.isInterruptionRequested():
+                self.cancelled.emit()
+            elif self.mode == "encrypt":
+                logger.exception("Encryption failed")
+                self.failed.emit(str(e))
             else:
-                result += char
-        return result
-
-    @staticmethod
-    def caesar_decipher(text, shift):
-        return CryptoEngine.caesar_cipher(text, -shift)
+                self.completed.emit(f"[!] Decryption error: {e}", None)
+            return
+        if self.isInterruptionRequested():
+            self.cancelled.emit()
+            return
+        self.completed.emit("".join(parts), self.stages)
 
-    # ---- Hex/Base64 ----
-    @staticmethod
-    def hex_encode(text):
-        return text.encode("utf-8").hex()
+class EncryptedDocumentWorker(QThread):
+    """Loads or saves a .bpenc document off the GUI thread.
 
-    @staticmethod
-    def hex_decode(text):
-        return bytes.fromhex(text).decode("utf-8")
+    Pass `text` to save it, leave it out to load. Without a cached `key` the key is
+    derived here from `passphrase`; `key`/`salt` are left on the worker for the
+    caller to cache.
+    """
+    loaded = Signal(str)
+    saved = Signal(str)
+    failed = Signal(str)
 
-    @staticmethod
-    def base64_encode(text):
-        return base64.b64encode(text.encode("utf-8")).decode("utf-8")
+    def __init__(self, path, key=None, salt=None, passphrase=None, text=None):
+        super().__init__()
+        self.path = path
+        self.key = key
+        self.salt = salt
+        self.passphrase = passphrase
+        self.text = text
+        self.ok = False
 
-    @staticmethod
-    def base64_decode(text):
-        return base64.b64decode(text).decode("utf-8")
+    def run(self):
+        try:
+            if self.text is None:
+                self._load()
+            else:
+                self._save()
+            self.ok = True
+        except InvalidTag:
+            self.failed.emit("Wrong passphrase, or the file has been modified or damaged.")
+        except Exception as e:
+            logger.exception("Encrypted document I/O failed for %s", self.path)
+            self.failed.emit(str(e))
+
+    def _load(self):
+        with open(self.path, "rb") as f:
+            header = DocumentHeader.read(f)
+            if self.key is None or self.salt != header.salt:
+                self.key = derive_document_key(self.passphrase, header.salt, header.kdf_params)
+                self.salt = header.salt
+            text = "".join(decrypt_document(f, self.key, header))
+        self.loaded.emit(text)
+
+    def _save(self):
+        if self.key is None:
+            self.salt = os.urandom(16)
+            self.key = derive_document_key(self.passphrase, self.salt)
+        write_encrypted_document(self.path, iter_text_chunks(self.text), self.key, self.salt)
+        self.saved.emit(self.path)
+
+class AutosaveWorker(QThread):
+    """Writes one encrypted autosave snapshot off the GUI thread."""
+    saved = Signal()
+    failed = Signal(str)
+
+    def __init__(self, path, text, key):
+        super().__init__()
+        self.path = path
+        self.text = text
+        self.key = key
 
-    # ---- AES ----
-    @staticmethod
-    def valid_aes_key(key):
-        return len(key) in (16, 24, 32)
+    def run(self):
+        try:
+            # Session-key snapshots have no KDF, so the header salt is unused
+            write_encrypted_document(self.path, iter_text_chunks(self.text), self.key, bytes(16))
+            self.saved.emit()
+        except Exception as e:
+            logger.exception("Encrypted autosave failed")
+            self.failed.emit(str(e))
 
-    @staticmethod
-    def aes_encrypt(plaintext, key):
-        if not CryptoEngine.valid_aes_key(key):
-            raise ValueError("AES key must be 16, 24, or 32 characters long")
-        key_bytes = key.encode()
-        iv = os.urandom(16)
-        cipher = Cipher(algorithms.AES(key_bytes), modes.CBC(iv), backend=default_backend())
-        padder = padding.PKCS7(128).padder()
-        padded = padder.update(plaintext.encode()) + padder.finalize()
-        encryptor = cipher.encryptor()
-        enc = encryptor.update(padded) + encryptor.finalize()
-        return base64.b64encode(iv + enc).decode("utf-8")
+# --------------------
+# Page layout for printing and PDF export
+# --------------------
+# A pagination is the list of page starts, (block number, line number within the
+# block), followed by the start of the page after the last one laid out; for a
+# whole document that is (blockCount, 0). Laying a block out again from its start
+# reproduces a page exactly, so a pagination costs one small tuple per page.
+# Only the starts are cached, not the QTextLayouts: the preview and the final
+# print redo the line breaking of the pages they draw, but a cached document
+# costs a few bytes per page instead of a layout per block.
+
+def page_text_option(font, device) -> QTextOption:
+    option = QTextOption()
+    option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+    option.setTabStopDistance(QFontMetricsF(font, device).horizontalAdvance(" ") * PDF_TAB_SPACES)
+    return option
+
+def layout_text_block(text, font, option, width) -> QTextLayout:
+    """Lay out one block; `font` must already be resolved for the device (QFont(font, device))."""
+    layout = QTextLayout(text, font)
+    layout.setTextOption(option)
+    layout.beginLayout()
+    while True:
+        line = layout.createLine()
+        if not line.isValid():
+            break
+        line.setLineWidth(width)
+    layout.endLayout()
+    return layout
+
+def paginate_document(document, font, device, cancelled=None, max_pages=None):
+    """Pagination of `document` on `device`'s pages, stopping after `max_pages`.
+
+    Returns None if `cancelled()` turned true.
+    """
+    font = QFont(font, device)
+    option = page_text_option(font, device)
+    width, height = device.width(), device.height()
+    starts = [(0, 0)]
+    y = 0.0
+    block = document.begin()
+    while block.isValid():
+        if cancelled is not None and cancelled():
+            return None
+        layout = layout_text_block(block.text(), font, option, width)
+        for i in range(layout.lineCount()):
+            line_height = layout.lineAt(i).height()
+            if y and y + line_height > height:
+                starts.append((block.blockNumber(), i))
+                if max_pages is not None and len(starts) > max_pages:
+                    return starts
+                y = 0.0
+            y += line_height
+        block = block.next()
+    starts.append((document.blockCount(), 0))
+    return starts
+
+def pagination_complete(document, starts) -> bool:
+    return starts[-1] == (document.blockCount(), 0)
+
+def page_indices(starts, pages=None):
+    """0-based indices of the pages to print; `pages` is a 1-based (first, last) range or None."""
+    count = len(starts) - 1
+    if pages is None:
+        return range(count)
+    first, last = pages
+    indices = range(max(first, 1) - 1, min(last, count))
+    if not indices:
+        raise ValueError(f"The document has only {count} page(s).")
+    return indices
+
+def printer_page_range(printer):
+    """The 1-based (first, last) pages chosen in a print dialog, or None for all of them."""
+    if printer.printRange() == QPrinter.PrintRange.PageRange and printer.fromPage():
+        return printer.fromPage(), max(printer.fromPage(), printer.toPage())
+    return None
+
+def pagination_key(document, font, printer):
+    """What a pagination depends on: document content, font, and page size/margins/resolution."""
+    rect = printer.pageRect(QPrinter.Unit.DevicePixel)
+    return (id(document), document.revision(), document.characterCount(), font.toString(),
+            printer.resolution(), rect.width(), rect.height())
+
+def read_page_blocks(document, starts, index):
+    """(text, first line, end line or None) for each block on page `index`."""
+    (block_number, first_line), (end_block, end_line) = starts[index], starts[index + 1]
+    block = document.findBlockByNumber(block_number)
+    pieces = []
+    while block.isValid() and block_number < end_block:
+        pieces.append((block.text(), first_line, None))
+        first_line = 0
+        block = block.next()
+        block_number += 1
+    if end_line and block.isValid():
+        pieces.append((block.text(), first_line, end_line))
+    return pieces
+
+def layout_page(pieces, font, option, width):
+    return [(layout_text_block(text, font, option, width), first, end) for text, first, end in pieces]
+
+def draw_page(painter, layouts):
+    y = 0.0
+    for layout, first, end in layouts:
+        for i in range(first, layout.lineCount() if end is None else end):
+            line = layout.lineAt(i)
+            line.draw(painter, QPointF(0, y))
+            y += line.height()
+
+def render_document_pages(painter, device, document, font, starts, indices, cancelled=None, on_page=None) -> bool:
+    """Draw the pages in `indices` onto `device`, laying out one page at a time.
+
+    Layout stays on the painting thread: a QFont resolved for the device, and the
+    QTextLayouts built from it, are not safe to share between threads, and PyQt
+    holds the GIL through these calls anyway. Returns False if `cancelled()`
+    turned true.
+    """
+    font = QFont(font, device)
+    option = page_text_option(font, device)
+    width = device.width()
+    for drawn, index in enumerate(indices):
+        if cancelled is not None and cancelled():
+            return False
+        if drawn:
+            device.newPage()
+        draw_page(painter, layout_page(read_page_blocks(document, starts, index), font, option, width))
+        if on_page is not None:
+            on_page(drawn + 1)
+    return True
+
+class PrintWorker(QThread):
+    """Paginates a document for `printer` and, with `print_pages`, prints it.
+
+    `document` should be a clone (it moves to this thread). Pass the `starts` of a
+    cached pagination to skip straight to printing; with a 1-based `pages` range,
+    layout stops after the last page asked for. The printer belongs to this thread
+    until it finishes.
+    """
+    paginated = Signal(object)
+    page_done = Signal(int, int)  # pages printed, total
+    printed = Signal(int)
+    failed = Signal(str)
+
+    def __init__(self, document, font, printer, starts=None, print_pages=True, pages=None):
+        super().__init__()
+        self.document = document
+        self.document.moveToThread(self)
+        self.font = font
+        self.printer = printer
+        self.starts = starts
+        self.print_pages = print_pages
+        self.pages = pages
 
-    @staticmethod
-    def aes_decrypt(ciphertext, key):
-        if not CryptoEngine.valid_aes_key(key):
-            raise ValueError("AES key must be 16, 24, or 32 characters long")
-        raw = base64.b64decode(ciphertext)
-        iv, ct = raw[:16], raw[16:]
-        cipher = Cipher(algorithms.AES(key.encode()), modes.CBC(iv), backend=default_backend())
-        decryptor = cipher.decryptor()
-        padded = decryptor.update(ct) + decryptor.finalize()
-        unpadder = padding.PKCS7(128).unpadder()
-        return (unpadder.update(padded) + unpadder.finalize()).decode()
-
-    # ---- German words insertion ----
-    def insert_german_words(self, text, interval):
-        if not interval or interval < 1:
-            return text
-        words = text.split()
-        result = []
-        for i, word in enumerate(words):
-            result.append(word)
-            if (i + 1) % interval == 0:
-                result.append(self.german_marker + self.german_words[(i // interval) % len(self.german_words)])
-        return ' '.join(result)
-
-    def remove_german_words(self, text):
-        return ' '.join(word for word in text.split() if not word.startswith(self.german_marker))
-
-    # ---- Pipelines ----
-    def encrypt_pipeline(self, text, shift, key, interval):
-        step1 = self.insert_german_words(text, interval)
-        step2 = self.caesar_cipher(step1, shift)
-        step3 = self.hex_encode(step2)
-        step4 = self.base64_encode(step3)
-        encrypted = self.aes_encrypt(step4, key)
-        debug_steps = {
-            'Inserted German Words': step1,
-            'Caesar Cipher': step2,
-            'Hex Encoded': step3,
-            'Base64 Encoded': step4,
-            'AES Encrypted': encrypted
-        }
-        return encrypted, debug_steps
+    def run(self):
+        try:
+            if self.starts is None:
+                self.starts = paginate_document(self.document, self.font, self.printer, self.isInterruptionRequested,
+                                                self.pages[1] if self.pages else None)
+                if self.starts is None:
+                    return
+                self.paginated.emit(self.starts)
+            if self.print_pages:
+                self._print()
+        except Exception as e:
+            logger.exception("Printing failed")
+            self.failed.emit(str(e))
+        finally:
+            self.document = None
+
+    def _print(self):
+        indices = page_indices(self.starts, self.pages)
+        painter = QPainter()
+        if not painter.begin(self.printer):
+            raise OSError("The printer could not be started.")
+        try:
+            done = render_document_pages(painter, self.printer, self.document, self.font, self.starts, indices,
+                                         self.isInterruptionRequested,
+                                         lambda drawn: self.page_done.emit(drawn, len(indices)))
+        finally:
+            painter.end()
+        if done:
+            self.printed.emit(len(indices))
+        else:
+            self.printer.abort()
+
+class PdfExportWorker(QThread):
+    """Writes a cloned QTextDocument to PDF with QPdfWriter, off the GUI thread.
+
+    Blocks are laid out one at a time with QTextLayout and drawn line by line, so
+    only the current block's layout is in memory, and QPdfWriter flushes each page
+    to the file as soon as the next one starts. Without QPdfWriter the blocks are
+    fed to fpdf instead (write_pdf_fpdf). A 1-based `page_range` (QPdfWriter only)
+    paginates up to its last page and renders just those pages. The output goes
+    to a temp file that replaces `path` only when every page has been written.
+    """
+    page_done = Signal(int, int)  # pages written, percent of the document
+    saved = Signal(str)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, document, path, font, page_range=None):
+        super().__init__()
+        self.document = document
+        self.document.moveToThread(self)
+        self.path = path
+        self.font = font
+        self.page_range = page_range
+        self.pages = 0
+        self._position = 0
 
-    def decrypt_pipeline(self, text, shift, key, interval):
+    def run(self):
+        fd, tmp = tempfile.mkstemp(prefix=".bunnypad-", suffix=".pdf",
+                                   dir=os.path.dirname(os.path.abspath(self.path)))
+        os.close(fd)
         try:
-            step1 = self.aes_decrypt(text, key)
-            step2 = self.base64_decode(step1)
-            step3 = self.hex_decode(step2)
-            step4 = self.caesar_decipher(step3, shift)
-            clean = self.remove_german_words(step4)
-            debug_steps = {
-                'AES Decrypted': step1,
-                'Base64 Decoded': step2,
-                'Hex Decoded': step3,
-                'Caesar Deciphered': step4,
-                'Cleaned Text': clean
-            }
-            return clean, debug_steps
+            if self._write(tmp):
+                os.replace(tmp, self.path)
+                tmp = None
+                self.saved.emit(self.path)
+            else:
+                self.cancelled.emit()
         except Exception as e:
-            return f"[!] Decryption error: {e}", {}
+            logger.exception("PDF export failed for %s", self.path)
+            self.failed.emit(str(e))
+        finally:
+            self.document = None
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+
+    def _write(self, tmp) -> bool:
+        if QPdfWriter is None:
+            return write_pdf_fpdf(self._lines(), tmp, self._fpdf_page, self.isInterruptionRequested)
+        writer = QPdfWriter(tmp)
+        writer.setTitle(os.path.basename(self.path))
+        writer.setCreator(APP_NAME)
+        writer.setResolution(PDF_RESOLUTION)
+        writer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
+        writer.setPageMargins(QMarginsF(*PDF_MARGINS_MM), QPageLayout.Unit.Millimeter)
+        painter = QPainter()
+        if not painter.begin(writer):
+            raise OSError(f"Cannot write {self.path}")
+        try:
+            if self.page_range is not None:
+                return self._write_range(writer, painter)
+            font = QFont(self.font, writer)
+            painter.setFont(font)
+            width, height = writer.width(), writer.height()
+            option = page_text_option(font, writer)
+            total = max(1, self.document.characterCount())
+            y = 0.0
+            block = self.document.begin()
+            while block.isValid():
+                if self.isInterruptionRequested():
+                    return False
+                layout = layout_text_block(block.text(), font, option, width)
+                for i in range(layout.lineCount()):
+                    line = layout.lineAt(i)
+                    if y and y + line.height() > height:
+                        writer.newPage()
+                        self.pages += 1
+                        self.page_done.emit(self.pages, block.position() * 100 // total)
+                        y = 0.0
+                    line.draw(painter, QPointF(0, y))
+                    y += line.height()
+                block = block.next()
+            self.pages += 1
+            self.page_done.emit(self.pages, 100)
+            return True
+        finally:
+            painter.end()
+
+    def _write_range(self, writer, painter) -> bool:
+        starts = paginate_document(self.document, self.font, writer, self.isInterruptionRequested, self.page_range[1])
+        if starts is None:
+            return False
+        indices = page_indices(starts, self.page_range)
+
+        def on_page(drawn):
+            self.pages = drawn
+            self.page_done.emit(drawn, drawn * 100 // len(indices))
+
+        return render_document_pages(painter, writer, self.document, self.font, starts, indices,
+                                     self.isInterruptionRequested, on_page)
+
+    def _lines(self):
+        block = self.document.begin()
+        while block.isValid():
+            self._position = block.position()
+            yield block.text()
+            block = block.next()
+
+    def _fpdf_page(self, pages):
+        self.pages = pages
+        self.page_done.emit(pages, self._position * 100 // max(1, self.document.characterCount()))
 
 # --------------------
 # Cryptography GUI
@@ -1559,6 +2987,8 @@ class CryptoGUI(QWidget):
         super().__init__(parent, flags)
         self.setObjectName("CryptoGUI")
         self.engine = CryptoEngine()
+        self.worker = None
+        self.debug_log = None
         self.setWindowTitle("RCCMITOWOATAS Encryption Tool")
         icon = get_icon_path("bunnypad")
         if icon:
@@ -1665,9 +3095,16 @@ class CryptoGUI(QWidget):
         btn_row = QHBoxLayout()
         self.go_btn = QPushButton("Run")
         self.copy_btn = QPushButton("Copy Output")
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
         btn_row.addWidget(self.go_btn)
+        btn_row.addWidget(self.cancel_btn)
         btn_row.addWidget(self.copy_btn)
         input_layout.addLayout(btn_row)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.hide()
+        input_layout.addWidget(self.progress_bar)
 
         # --- Output section ---
         output_widget = QWidget()
@@ -1701,6 +3138,7 @@ class CryptoGUI(QWidget):
                 # QMessageBox.information(self, "Debugging the Debugger", "[Show] toggle request acknowledged")
                 self.debug_box.show()
                 splitter.setSizes([200, 150, 100])
+                self.render_debug()
             else:
                 # QMessageBox.information(self, "Debugging the Debugger", "[Hide] toggle request acknowledged")
                 self.debug_box.hide()
@@ -1708,6 +3146,11 @@ class CryptoGUI(QWidget):
 
         self.debug_box.hide()
         self.verbose_check.toggled.connect(toggle_debug)
+        self.go_btn.clicked.connect(self.run_crypto)
+        self.cancel_btn.clicked.connect(self.cancel_crypto)
+        self.copy_btn.clicked.connect(self.copy_output)
+        self.import_btn.clicked.connect(self.import_rccm_file)
+        self.export_btn.clicked.connect(self.export_rccm_file)
 
     # ---- UI Handlers ----
     def on_mode_changed(self):
@@ -1738,8 +3181,9 @@ class CryptoGUI(QWidget):
         self.mode_combo.setCurrentText("Decrypt")
         self.shift_spin.setValue(config.get("caesar_shift", 0))
         self.interval_spin.setValue(config.get("german_interval", 2))
-        self.output_box.setText(config.get("encrypted", ""))
-        self.copy_btn.setEnabled(True)
+        # Run reads the input box, so the ciphertext goes there
+        self.input_box.setPlainText(config.get("encrypted", ""))
+        self.output_box.clear()
         QMessageBox.information(self, "Import Successful", f"Imported {os.path.basename(filepath)}\nEnter your AES key and press Run to decrypt.")
 
     def export_rccm_file(self):
@@ -1752,25 +3196,24 @@ class CryptoGUI(QWidget):
             self.show_error("AES key must be exactly 16, 24, or 32 characters long to export config.")
             return
         config_data = {
-            "encrypted": encrypted_message,
             "caesar_shift": self.shift_spin.value(),
             "aes_key_length": len(key),
             "german_interval": self.interval_spin.value(),
             "timestamp": datetime.datetime.now().isoformat()
         }
-        hex_data = json.dumps(config_data, indent=2).encode("utf-8").hex()
         filepath, _ = QFileDialog.getSaveFileName(self, "Save RCCM Configuration File", "", "RCCM Files (*.rccm)")
         if filepath:
             if not filepath.lower().endswith(".rccm"):
                 filepath += ".rccm"
             try:
-                with open(filepath, "w", encoding="utf-8") as f:
-                    f.write(hex_data)
+                write_rccm(filepath, encrypted_message, config_data)
                 QMessageBox.information(self, "Export Successful", f"Configuration exported to:\n{filepath}")
             except Exception as e:
                 self.show_error(f"Failed to write file:\n{e}")
 
     def run_crypto(self):
+        if self.worker is not None and self.worker.isRunning():
+            return
         text = self.input_box.toPlainText().strip()
         key = self.key_box.text().strip()
         shift = self.shift_spin.value()
@@ -1785,18 +3228,43 @@ class CryptoGUI(QWidget):
         if not CryptoEngine.valid_aes_key(key):
             self.show_error("AES key must be exactly 16, 24, or 32 characters long.")
             return
-        if mode == 'encrypt':
-            output_text, debug_info = self.engine.encrypt_pipeline(text, shift, key, interval)
-        else:
-            output_text, debug_info = self.engine.decrypt_pipeline(text, shift, key, interval)
-        self.output_box.setText(output_text)
+        self.debug_log = None
+        self.debug_box.clear()
+        self.worker = CryptoWorker(self.engine, mode, text, shift, key, interval, verbose)
+        self.worker.progress.connect(self.progress_bar.setValue)
+        self.worker.completed.connect(self.on_crypto_completed)
+        self.worker.failed.connect(self.on_crypto_failed)
+        self.worker.cancelled.connect(self.on_crypto_cancelled)
+        self.set_running(True)
+        self.worker.start()
+
+    def cancel_crypto(self):
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.requestInterruption()
+            self.cancel_btn.setEnabled(False)
+
+    def set_running(self, running):
+        self.go_btn.setEnabled(not running)
+        self.cancel_btn.setEnabled(running)
+        self.mode_combo.setEnabled(not running)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(running)
+
+    def on_crypto_failed(self, message):
+        self.set_running(False)
+        self.show_error(message)
+
+    def on_crypto_cancelled(self):
+        self.set_running(False)
+        self.output_box.clear()
+
+    def on_crypto_completed(self, output_text, stages):
+        self.set_running(False)
+        self.output_box.setPlainText(output_text)
         self.copy_btn.setEnabled(True)
-        self.debug_box.setVisible(verbose)
-        if verbose:
-            debug_lines = [f"[{k}]: {v}" for k, v in debug_info.items()]
-            self.debug_box.setText("\n\n".join(debug_lines))
-        else:
-            self.debug_box.clear()
+        self.debug_log = stages
+        if self.verbose_check.isChecked():
+            self.render_debug()
         if self.critical_check.isChecked():
             if CLIPBOARD_ENABLED:
                 import pyperclip
@@ -1805,6 +3273,26 @@ class CryptoGUI(QWidget):
             else:
                 QMessageBox.warning(self, "Clipboard", "pyperclip not installed; clipboard functionality disabled.")
 
+    def render_debug(self):
+        """Fill the debug pane from the last run; only called while it is visible."""
+        log = self.debug_log
+        if log is None:
+            self.debug_box.clear()
+            return
+        debug_lines = []
+        for name in log.parts:
+            line = f"[{name}]: {log.text(name)}"
+            if log.truncated(name):
+                line += f"\n... ({log.sizes[name]:,} characters total, showing the first {log.kept.get(name, 0):,})"
+            debug_lines.append(line)
+        self.debug_box.setPlainText("\n\n".join(debug_lines))
+
+    def closeEvent(self, event):
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.requestInterruption()
+            self.worker.wait()
+        super().closeEvent(event)
+
     def copy_output(self):
         if CLIPBOARD_ENABLED:
             import pyperclip
@@ -1837,6 +3325,22 @@ class Notepad(QMainWindow):
         self.file_path = None
         self.unsaved_changes_flag = False
         self.update_thread = None
+        self.encrypted_document = False
+        self.doc_key = None  # (salt, key) of the passphrase used for .bpenc files this session
+        self.doc_worker = None
+        self.encrypt_autosave = QSettings().value("Autosave/encrypt", False, type=bool)
+        self.autosave_key = None  # random per-session key for encrypted snapshots, memory only
+        self.autosave_worker = None
+        self.snapshot_needed = False  # write a snapshot next cycle even without new edits
+        self.pending_snapshot = None  # last session's encrypted snapshot, if it wasn't restored
+        self.pdf_worker = None
+        self.printer = None  # created on first use, so page setup carries over between prints
+        self.print_worker = None
+        self.pagination = None  # (pagination_key, page starts) of the last print layout
+        self.sysinfo_collector = None
+        self.performance_dialog = None
+        self.update_scheduler = UpdateScheduler(self)
+        self.update_scheduler.update_available.connect(self.on_update_available)
 
         # --- Mark session dirty on startup ---
         open(DIRTY_FILE, "w").close()
@@ -1866,11 +3370,12 @@ class Notepad(QMainWindow):
         self.statusbar.showMessage("Ready")
 
         # character map dock
-        self.character_map = CharacterWidget()
-        self.character_map.characterSelected.connect(self.insert_character)
+        self.character_panel = CharacterMapPanel()
+        self.character_map = self.character_panel.character_map
+        self.character_panel.characterSelected.connect(self.insert_character)
         self.character_map.closed.connect(lambda: self._toggle_character_map_action.setChecked(False))
         self.character_dock = QDockWidget(QCoreApplication.translate("MainWindow", "Character Map"), self)
-        self.character_dock.setWidget(self.character_map)
+        self.character_dock.setWidget(self.character_panel)
         self.character_dock.setAllowedAreas(Qt.DockWidgetArea.LeftDockWidgetArea | Qt.DockWidgetArea.RightDockWidgetArea)
         # 🔹 Theme toggling for dock when floating / docked
         def _char_dock_theme(floating):
@@ -1889,6 +3394,11 @@ class Notepad(QMainWindow):
         # track changes
         self.textedit.textChanged.connect(self.handle_text_changed)
         self.show()
+        if self.encrypt_autosave and self.autosave_key is None:
+            QTimer.singleShot(0, self.init_autosave_key)
+        if QSettings().value("Updates/auto_check", True, type=bool):
+            # Fires once the event loop is idle; the check itself runs on its own thread
+            QTimer.singleShot(0, self.update_scheduler.start)
 
     
     def create_actions_and_menus(self):
@@ -1919,6 +3429,10 @@ class Notepad(QMainWindow):
         save_as_action.triggered.connect(self.save_file_as)
         file_menu.addAction(save_as_action)
 
+        save_encrypted_action = QAction(QIcon(get_icon_path("encryption")), self.tr("Save Encrypted..."), self)
+        save_encrypted_action.triggered.connect(self.save_encrypted_as)
+        file_menu.addAction(save_encrypted_action)
+
         file_menu.addSeparator()
 
         print_pdf_action = QAction(QIcon(get_icon_path("pdf")), self.tr("Print to PDF..."), self)
@@ -1931,6 +3445,10 @@ class Notepad(QMainWindow):
         print_action.triggered.connect(self.file_print)
         file_menu.addAction(print_action)
 
+        print_preview_action = QAction(QIcon(get_icon_path("printer")), self.tr("Print Preview..."), self)
+        print_preview_action.triggered.connect(self.print_preview)
+        file_menu.addAction(print_preview_action)
+
         file_menu.addSeparator()
 
         exit_action = QAction(QIcon(get_icon_path("exit")), self.tr("Exit"), self)
@@ -2005,6 +3523,28 @@ class Notepad(QMainWindow):
         select_all_action.triggered.connect(self.textedit.selectAll)
         edit_menu.addAction(select_all_action)
 
+        transform_menu = edit_menu.addMenu(self.tr("Transform"))
+        for label, name in (
+            (self.tr("Hex Encode"), "hex_encode"),
+            (self.tr("Hex Decode"), "hex_decode"),
+            (self.tr("Base64 Encode"), "base64_encode"),
+            (self.tr("Base64 Decode"), "base64_decode"),
+            (self.tr("Caesar Shift..."), "caesar"),
+            None,
+            (self.tr("UPPERCASE"), "upper"),
+            (self.tr("lowercase"), "lower"),
+            None,
+            (self.tr("Normalize (NFC)"), "nfc"),
+            (self.tr("Normalize (NFD)"), "nfd"),
+        ):
+            if label is None:
+                transform_menu.addSeparator()
+                continue
+            label, name = label
+            action = QAction(label, self)
+            action.triggered.connect(lambda checked=False, name=name: self.transform_text(name))
+            transform_menu.addAction(action)
+
         # Format menu
         format_menu = QMenu(self.tr("Format"), self)
         menubar.addMenu(format_menu)
@@ -2054,6 +3594,17 @@ class Notepad(QMainWindow):
         tools_menu.addAction(toggle_character_map_action)
         self._toggle_character_map_action = toggle_character_map_action
 
+        encrypt_autosave_action = QAction(self.tr("Encrypt Autosave"), self)
+        encrypt_autosave_action.setCheckable(True)
+        encrypt_autosave_action.setChecked(self.encrypt_autosave)
+        encrypt_autosave_action.triggered.connect(self.set_encrypt_autosave)
+        tools_menu.addAction(encrypt_autosave_action)
+        self._encrypt_autosave_action = encrypt_autosave_action
+
+        performance_action = QAction(QIcon(get_icon_path("info")), self.tr("Performance"), self)
+        performance_action.triggered.connect(self.show_performance)
+        tools_menu.addAction(performance_action)
+
         # Help menu
         help_menu = QMenu(self.tr("Help"), self)
         menubar.addMenu(help_menu)
@@ -2093,6 +3644,12 @@ class Notepad(QMainWindow):
         update_action.triggered.connect(self.check_for_updates)
         help_menu.addAction(update_action)
 
+        auto_update_action = QAction(self.tr("Check For Updates Automatically"), self)
+        auto_update_action.setCheckable(True)
+        auto_update_action.setChecked(QSettings().value("Updates/auto_check", True, type=bool))
+        auto_update_action.triggered.connect(self.set_auto_update_check)
+        help_menu.addAction(auto_update_action)
+
         # toolbar
         self.toolbar = QToolBar(self)
         self.toolbar.setMovable(True)
@@ -2133,6 +3690,7 @@ class Notepad(QMainWindow):
         if not self.unsaved_changes_flag or self.warn_unsaved_changes():
             self.textedit.clear()
             self.file_path = None
+            self.encrypted_document = False
             self.unsaved_changes_flag = False
             self.setWindowTitle(self.tr("Untitled - BunnyPad"))
 
@@ -2166,11 +3724,16 @@ class Notepad(QMainWindow):
             )
             return
 
+        if is_encrypted_document(path):
+            self.open_encrypted(path)
+            return
+
         # Safe to open
         try:
             with open(path, "r", encoding="utf-8", errors="replace") as f:
                 self.textedit.setPlainText(f.read())
             self.file_path = path
+            self.encrypted_document = False
             self.unsaved_changes_flag = False
             self.setWindowTitle(f"{os.path.basename(path)} - BunnyPad")
         except Exception:
@@ -2184,7 +3747,7 @@ class Notepad(QMainWindow):
             QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Discard | QMessageBox.StandardButton.Cancel,
         )
         if ret == QMessageBox.StandardButton.Save:
-            return self.save_file()
+            return self.save_file() and self.finish_pending_save()
         if ret == QMessageBox.StandardButton.Cancel:
             return False
         return True
@@ -2193,6 +3756,8 @@ class Notepad(QMainWindow):
     def save_file(self) -> bool:
         if not self.file_path:
             return self.save_file_as()
+        if self.encrypted_document:
+            return self.start_encrypted_save(self.file_path)
         try:
             with open(self.file_path, "w", encoding="utf-8") as f:
                 f.write(self.textedit.toPlainText())
@@ -2210,10 +3775,118 @@ class Notepad(QMainWindow):
             return False
         # Append extension if needed
         self.file_path = path
+        self.encrypted_document = False
         return self.save_file()
 
+    # Encrypted documents
+    def ask_passphrase(self, confirm=False, prompt=None):
+        passphrase, ok = QInputDialog.getText(
+            self, self.tr("Passphrase"), prompt or self.tr("Document passphrase:"), QLineEdit.EchoMode.Password)
+        if not ok or not passphrase:
+            return None
+        if confirm:
+            again, ok = QInputDialog.getText(
+                self, self.tr("Passphrase"), self.tr("Repeat the passphrase:"), QLineEdit.EchoMode.Password)
+            if not ok:
+                return None
+            if again != passphrase:
+                QMessageBox.warning(self, self.tr("Passphrase"), self.tr("The passphrases do not match."))
+                return None
+        return passphrase
+
+    def save_encrypted_as(self) -> bool:
+        path, _ = QFileDialog.getSaveFileName(self, self.tr("Save Encrypted"), "", FILE_FILTERS["encrypted"])
+        if not path:
+            return False
+        if not path.lower().endswith(DOC_SUFFIX):
+            path += DOC_SUFFIX
+        # A new file always gets its own passphrase (and salt), never the last document's
+        passphrase = self.ask_passphrase(confirm=True)
+        if passphrase is None:
+            return False
+        self.file_path = path
+        self.encrypted_document = True
+        self.doc_key = None  # set again once this save succeeds; until then Ctrl+S asks
+        return self.start_encrypted_save(path, passphrase)
+
+    def start_encrypted_save(self, path, passphrase=None) -> bool:
+        """Encrypt the document to `path` on a worker; returns once the save has started.
+
+        With a `passphrase` a fresh key is derived; without one the cached key is
+        reused, and if there is none yet (say the first save failed) the user is asked.
+        """
+        if passphrase is None and self.doc_key is None:
+            passphrase = self.ask_passphrase(confirm=True)
+            if passphrase is None:
+                return False
+        if self.doc_worker is not None and self.doc_worker.isRunning():
+            self.doc_worker.wait()
+        salt, key = self.doc_key if passphrase is None else (None, None)
+        worker = EncryptedDocumentWorker(path, key, salt, passphrase, self.textedit.toPlainText())
+        revision = self.textedit.document().revision()
+        worker.saved.connect(lambda saved_path: self.on_encrypted_saved(worker, saved_path, revision))
+        worker.failed.connect(lambda message: QMessageBox.critical(
+            self, self.tr("Error"), self.tr("Failed to save file: %s") % message))
+        self.doc_worker = worker
+        self.statusbar.showMessage(self.tr("Encrypting..."))
+        worker.start()
+        return True
+
+    def finish_pending_save(self) -> bool:
+        """Block until a running encrypted save is done; used where the caller needs the outcome."""
+        worker = self.doc_worker
+        if worker is None or worker.text is None:
+            return True
+        worker.wait()
+        return worker.ok
+
+    def on_encrypted_saved(self, worker, path, revision):
+        if path != self.file_path:
+            return  # an earlier save finishing after Save Encrypted As moved on
+        self.doc_key = (worker.salt, worker.key)
+        self.statusbar.showMessage(self.tr("Saved encrypted document"), 3000)
+        # Edits made while the worker ran are not in the file
+        if self.textedit.document().revision() == revision:
+            self.unsaved_changes_flag = False
+            self.setWindowTitle(f"{os.path.basename(path)} - BunnyPad")
+
+    def open_encrypted(self, path):
+        try:
+            with open(path, "rb") as f:
+                header = DocumentHeader.read(f)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, self.tr("Error"), self.tr("Cannot open encrypted file: %s") % e)
+            return
+        key = salt = passphrase = None
+        if self.doc_key is not None and self.doc_key[0] == header.salt:
+            salt, key = self.doc_key
+        else:
+            passphrase = self.ask_passphrase()
+            if passphrase is None:
+                return
+        if self.doc_worker is not None and self.doc_worker.isRunning():
+            self.doc_worker.wait()
+        worker = EncryptedDocumentWorker(path, key, salt, passphrase)
+        worker.loaded.connect(lambda text: self.on_encrypted_loaded(worker, path, text))
+        worker.failed.connect(lambda message: QMessageBox.critical(
+            self, self.tr("Error"), self.tr("Cannot open encrypted file: %s") % message))
+        self.doc_worker = worker
+        self.statusbar.showMessage(self.tr("Decrypting..."))
+        worker.start()
+
+    def on_encrypted_loaded(self, worker, path, text):
+        self.doc_key = (worker.salt, worker.key)
+        self.textedit.setPlainText(text)
+        self.file_path = path
+        self.encrypted_document = True
+        self.unsaved_changes_flag = False
+        self.setWindowTitle(f"{os.path.basename(path)} - BunnyPad")
+        self.statusbar.clearMessage()
+
     
     def closeEvent(self, event):
+        # Let an in-flight encrypted save reach the disk before anything else
+        self.finish_pending_save()
         today = datetime.date.today()
         leroy_anniv = datetime.date(today.year, 4, 11)
         undertale_anniv = datetime.date(today.year, 9, 15)  # Set correct Undertale anniversary
@@ -2284,12 +3957,134 @@ class Notepad(QMainWindow):
 
     
     def file_print(self):
+        if self.print_busy():
+            return
+        printer = self.get_printer()
+        dlg = QPrintDialog(printer, self)
+        dlg.setOption(QAbstractPrintDialog.PrintDialogOption.PrintSelection, self.textedit.textCursor().hasSelection())
+        if not dlg.exec():
+            return
+        worker = self.start_print_worker(printer, print_pages=True,
+                                         selection_only=printer.printRange() == QPrinter.PrintRange.Selection,
+                                         pages=printer_page_range(printer))
+        worker.page_done.connect(lambda done, total: self.statusbar.showMessage(
+            self.tr("Printing page %d of %d...") % (done, total)))
+        worker.printed.connect(lambda pages: self.statusbar.showMessage(self.tr("Printed %d page(s)") % pages, 3000))
+        worker.failed.connect(lambda message: QMessageBox.critical(
+            self, self.tr("Error"), self.tr("Printing failed: %s") % message))
+
+    def print_preview(self):
+        if self.print_busy():
+            return
+        printer = self.get_printer()
+        if self.cached_pagination(printer) is not None:
+            self.show_print_preview(printer)
+            return
+        # Lay the pages out in the background first, so the preview opens on a warm cache
+        worker = self.start_print_worker(printer, print_pages=False)
+        worker.paginated.connect(lambda starts: self.show_print_preview(printer))
+        worker.failed.connect(lambda message: QMessageBox.critical(
+            self, self.tr("Error"), self.tr("Print preview failed: %s") % message))
+
+    def get_printer(self):
+        if self.printer is None:
+            self.printer = QPrinter(QPrinter.PrinterMode.HighResolution)
+        return self.printer
+
+    def print_busy(self) -> bool:
+        if self.print_worker is not None and self.print_worker.isRunning():
+            QMessageBox.information(self, self.tr("Print"), self.tr("A print job is still being prepared."))
+            return True
+        return False
+
+    def cached_pagination(self, printer, last_page=None):
+        """The cached pagination if it is current and reaches `last_page` (default: the end)."""
+        document = self.textedit.document()
+        if self.pagination is None or self.pagination[0] != pagination_key(document, self.textedit.font(), printer):
+            return None
+        starts = self.pagination[1]
+        if pagination_complete(document, starts) or (last_page is not None and len(starts) > last_page):
+            return starts
+        return None
+
+    def selection_document(self):
+        """A standalone document holding just the selected text, for printing or export."""
+        document = QTextDocument()
+        document.setDefaultFont(self.textedit.font())
+        QTextCursor(document).insertFragment(self.textedit.textCursor().selection())
+        return document
+
+    def start_print_worker(self, printer, print_pages, selection_only=False, pages=None):
+        document, font = self.textedit.document(), self.textedit.font()
+        if selection_only:
+            worker = PrintWorker(self.selection_document(), font, printer, None, print_pages)
+        else:
+            key = pagination_key(document, font, printer)
+            starts = self.cached_pagination(printer, pages[1] if pages else None)
+            worker = PrintWorker(document.clone(), font, printer, starts, print_pages, pages)
+            worker.paginated.connect(lambda starts: setattr(self, "pagination", (key, starts)))
+        if worker.starts is None:
+            self.statusbar.showMessage(self.tr("Laying out pages..."))
+            worker.paginated.connect(lambda starts: self.statusbar.clearMessage())
+        self.print_worker = worker
+        worker.start()
+        return worker
+
+    def show_print_preview(self, printer):
+        dlg = QPrintPreviewDialog(printer, self)
+        dlg.paintRequested.connect(self.paint_print_pages)
+        dlg.exec()
+
+    def paginate_with_progress(self, printer, selection_only, pages):
+        """Paginate on a PrintWorker and wait for it without blocking the GUI thread.
+
+        paintRequested has to draw before it returns, so this runs a local event
+        loop under a progress dialog. Returns None if cancelled or failed.
+        """
+        worker = self.start_print_worker(printer, False, selection_only, pages)
+        worker.failed.connect(lambda message: QMessageBox.critical(
+            self, self.tr("Error"), self.tr("Print preview failed: %s") % message))
+        progress = QProgressDialog(self.tr("Laying out pages..."), self.tr("Cancel"), 0, 0,
+                                   QApplication.activeModalWidget() or self)
+        progress.setWindowTitle(self.tr("Print Preview"))
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(worker.requestInterruption)
+        loop = QEventLoop()
+        worker.finished.connect(loop.quit)
+        if not worker.isFinished():
+            loop.exec()
+        progress.reset()
+        if worker.isInterruptionRequested():
+            return None
+        return worker.starts
+
+    def paint_print_pages(self, printer):
+        """QPrintPreviewDialog callback, for the preview and for its Print button alike."""
+        font = self.textedit.font()
+        selection_only = (printer.printRange() == QPrinter.PrintRange.Selection
+                          and self.textedit.textCursor().hasSelection())
+        if selection_only:
+            document, pages, starts = self.selection_document(), None, None
+        else:
+            document = self.textedit.document()
+            pages = printer_page_range(printer)
+            starts = self.cached_pagination(printer, pages[1] if pages else None)
+        if starts is None:  # a selection, or page setup changed inside the preview
+            starts = self.paginate_with_progress(printer, selection_only, pages)
+            if starts is None:
+                return
         try:
-            dlg = QPrintDialog()
-            if dlg.exec():
-                self.textedit.print(dlg.printer())
-        except Exception:
-            logger.exception("Print failed")
+            indices = page_indices(starts, pages)
+        except ValueError:
+            indices = page_indices(starts)
+        painter = QPainter()
+        if not painter.begin(printer):
+            return
+        try:
+            render_document_pages(painter, printer, document, font, starts, indices)
+        finally:
+            painter.end()
 
     
     def update_statusbar(self):
@@ -2315,6 +4110,7 @@ class Notepad(QMainWindow):
         font, ok = QFontDialog.getFont(self)
         if ok and font:
             self.textedit.setFont(font)
+            self.character_panel.font_combo.setCurrentFont(font)
 
     
     def toggle_toolbar(self):
@@ -2338,18 +4134,33 @@ class Notepad(QMainWindow):
 
     
     def sysinfo(self):
-        # Show a loading message first
-        QApplication.processEvents()  # Process any pending events
-        
         try:
-            system_info_text = get_system_info()
-            display_os_str = identify_os()
+            # Open at once with placeholders; the collector fills them in as probes finish
+            placeholder = self.tr("Detecting...")
+            lines = [f"{label}: {placeholder}" for label, probe, cacheable in SYSINFO_PROBES]
+            lines.append(f"Screen Resolution: {get_screen_resolution()}")
+            display_os_str = load_sysinfo_cache().get("OS", placeholder)  # set_field fills it in
             current_directory_str = os.getcwd()
-            dlg = SystemInfoDialog(system_info_text, display_os_str, current_directory_str)
+            dlg = SystemInfoDialog("\n".join(lines), display_os_str, current_directory_str)
+            collector = self.sysinfo_collector
+            if collector is None or not collector.isRunning():
+                collector = self.sysinfo_collector = SystemInfoCollector()
+                collector.start()
+            collector.probed.connect(dlg.set_field)
+            for label, value in list(collector.results.items()):
+                dlg.set_field(label, value)
             dlg.exec()
         except Exception as e:
             logger.exception("sysinfo failed")
-            QMessageBox.critical(self, self.tr("Error"), self.tr(f"Failed to get system information: {str(e)}"))
+            QMessageBox.critical(self, self.tr("Error"), self.tr("Failed to get system information: %s") % e)
+
+    
+    def show_performance(self):
+        if self.performance_dialog is None:
+            self.performance_dialog = PerformanceDialog(self.textedit.document(), self)
+        self.performance_dialog.show()
+        self.performance_dialog.raise_()
+        self.performance_dialog.activateWindow()
 
     
     def feature_not_ready(self):
@@ -2412,9 +4223,42 @@ class Notepad(QMainWindow):
 
     
     def print_to_pdf(self):
+        if QPdfWriter is None and FPDF is None:
+            QMessageBox.critical(self, self.tr("Error"), self.tr("PDF export needs Qt's QPdfWriter or the fpdf package."))
+            return
+        if self.pdf_worker is not None and self.pdf_worker.isRunning():
+            QMessageBox.information(self, self.tr("Print to PDF"), self.tr("A PDF export is already running."))
+            return
+        selection_only, page_range = False, None
+        has_selection = self.textedit.textCursor().hasSelection()
+        if has_selection or QPdfWriter is not None:  # page ranges need QPdfWriter's pagination
+            options = PdfRangeDialog(has_selection, QPdfWriter is not None, self)
+            if not options.exec():
+                return
+            selection_only, page_range = options.selection_only(), options.page_range()
         path, _ = QFileDialog.getSaveFileName(self, self.tr("Print to PDF [Save as]"), "", FILE_FILTERS["pdf"])
-        if path:
-            save_as_pdf(self.textedit.toPlainText(), path)
+        if not path:
+            return
+        # The worker gets its own copy, so editing can go on while it paginates
+        document = self.selection_document() if selection_only else self.textedit.document().clone()
+        worker = PdfExportWorker(document, path, self.textedit.font(), page_range)
+        progress = QProgressDialog(self.tr("Exporting PDF..."), self.tr("Cancel"), 0, 100, self)
+        progress.setWindowTitle(self.tr("Print to PDF"))
+        progress.setMinimumDuration(500)
+        progress.canceled.connect(worker.requestInterruption)
+        worker.page_done.connect(lambda pages, percent: self.on_pdf_page(progress, pages, percent))
+        worker.saved.connect(lambda saved_path: self.statusbar.showMessage(
+            self.tr("Exported %d page(s) to %s") % (worker.pages, os.path.basename(saved_path)), 5000))
+        worker.failed.connect(lambda message: QMessageBox.critical(
+            self, self.tr("Error"), self.tr("Failed to export PDF: %s") % message))
+        worker.cancelled.connect(lambda: self.statusbar.showMessage(self.tr("PDF export cancelled"), 3000))
+        worker.finished.connect(progress.reset)
+        self.pdf_worker = worker
+        worker.start()
+
+    def on_pdf_page(self, progress, pages, percent):
+        progress.setLabelText(self.tr("Exporting PDF... page %d") % pages)
+        progress.setValue(min(percent, 99))  # reaching the maximum would close the dialog early
 
     
     def date_and_time(self):
@@ -2432,6 +4276,68 @@ class Notepad(QMainWindow):
             self.textedit.ensureCursorVisible()
 
     
+    def transform_text(self, name):
+        """Rewrite the selection (or the whole document) in place with a TEXT_TRANSFORMS entry.
+
+        The text goes through a QTextCursor TRANSFORM_CHUNK_SIZE positions at a time,
+        each chunk replaced as soon as it is transformed, all in one edit block so a
+        single Undo restores it. toPlainText() is never called, so a huge selection
+        isn't copied whole on top of the document.
+        """
+        shift = 0
+        if name == "caesar":
+            shift, ok = QInputDialog.getInt(self, self.tr("Caesar Shift"), self.tr("Shift letters by:"), 3, -25, 25)
+            if not ok:
+                return
+        transform = text_transform(name, shift)
+        doc = self.textedit.document()
+        selection = self.textedit.textCursor()
+        if selection.hasSelection():
+            start, end = selection.selectionStart(), selection.selectionEnd()
+        else:
+            start, end = 0, doc.characterCount() - 1  # minus the final paragraph separator
+        if start == end:
+            return
+
+        def utf16_len(text):
+            return len(text.encode("utf-16-le")) // 2
+
+        cursor = QTextCursor(doc)
+        pos, remaining = start, end - start
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        cursor.beginEditBlock()
+        try:
+            while remaining or transform is not None:
+                if remaining:
+                    step = min(TRANSFORM_CHUNK_SIZE, remaining)
+                    # Positions are UTF-16 units; don't split a surrogate pair.
+                    if step < remaining and "\ud800" <= doc.characterAt(pos + step - 1) <= "\udbff":
+                        step += 1
+                    cursor.setPosition(pos)
+                    cursor.setPosition(pos + step, QTextCursor.MoveMode.KeepAnchor)
+                    out = transform.feed(cursor.selectedText().replace("\u2029", "\n"))
+                    remaining -= step
+                else:
+                    cursor.setPosition(pos)
+                    out, transform = transform.finish(), None
+                if out:
+                    cursor.insertText(out)
+                    pos += utf16_len(out)
+                else:
+                    cursor.removeSelectedText()
+        except (ValueError, UnicodeError) as e:
+            cursor.endEditBlock()
+            doc.undo()
+            QApplication.restoreOverrideCursor()
+            QMessageBox.critical(self, self.tr("Transform"), self.tr("The text could not be transformed: {0}").format(e))
+            return
+        cursor.endEditBlock()
+        QApplication.restoreOverrideCursor()
+        selection.setPosition(start)
+        selection.setPosition(pos, QTextCursor.MoveMode.KeepAnchor)
+        self.textedit.setTextCursor(selection)
+
+    
     def find_function(self):
         word_to_find, ok = QInputDialog.getText(self, self.tr("Find"), self.tr("Enter the text you want to find:"))
         if ok and word_to_find:
@@ -2468,12 +4374,25 @@ class Notepad(QMainWindow):
 
     
     def on_update_check_completed(self, release_info: dict):
-        if release_info:
-            # show info using first available tag
-            tag = release_info.get("stable", {}).get("version") or release_info.get("prerelease", {}).get("version")
-            QMessageBox.information(self, self.tr("Update"), self.tr("New version available: %s") % tag)
+        if self.update_thread.status is None:
+            QMessageBox.warning(self, self.tr("Update"), self.tr("Could not check for updates."))
+            return
+        release = newer_release(release_info)
+        if release:
+            QMessageBox.information(self, self.tr("Update"), self.tr("New version available: %s") % release["version"])
         else:
             QMessageBox.information(self, self.tr("Update"), self.tr("No updates available."))
+
+    def on_update_available(self, release: dict):
+        # Background checks only use the status bar, never a modal dialog
+        self.statusbar.showMessage(self.tr("BunnyPad %s is available (Help > Check For Updates)") % release["version"])
+
+    def set_auto_update_check(self, enabled):
+        QSettings().setValue("Updates/auto_check", enabled)
+        if enabled:
+            self.update_scheduler.start()
+        else:
+            self.update_scheduler.stop()
     
     def open_encryption_tool(self):
         dlg = TextEncToolDialog(self)
@@ -2483,29 +4402,140 @@ class Notepad(QMainWindow):
         self.unsaved_changes_flag = True
 
     def autoSave(self):
-        if not self.unsaved_changes_flag:
+        if not (self.unsaved_changes_flag or self.snapshot_needed):
             return
+        if self.pending_snapshot is not None:
+            return  # paused until last session's snapshot is restored or discarded
 
         if self.file_path:
             fname = os.path.basename(self.file_path) + ".bptmp"
             temp_path = os.path.join(BUNNYPAD_TEMP, fname)
-            with open(temp_path, "w", encoding="utf-8") as f:
-                f.write("[TYPE:WITHPATH]\n")
-                f.write(self.file_path + "\n")
-                f.write("[DATA]\n")
-                f.write(self.textedit.toPlainText())
-            self.saveState(temp_path)
+            snapshot = "[TYPE:WITHPATH]\n" + self.file_path + "\n[DATA]\n"
+            body = self.textedit.toPlainText()
         else:
             temp_path = os.path.join(BUNNYPAD_TEMP, "unsaved_note.bptmp")
-            text = self.textedit.toPlainText()
-            encoded = binascii.hexlify(text.encode("utf-8")).decode("utf-8")
-            with open(temp_path, "w", encoding="utf-8") as f:
-                f.write("[TYPE:UNSAVED]\n")
-                f.write(encoded)
-            self.saveState(temp_path)
-
-        self.textedit.document().setModified(False)
-        self.unsaved_changes_flag = False
+            snapshot = "[TYPE:UNSAVED]\n"
+            body = binascii.hexlify(self.textedit.toPlainText().encode("utf-8")).decode("utf-8")
+
+        if self.encrypt_autosave:
+            # Never fall back to plaintext; skip the cycle until there is a key and the last write is done
+            if self.autosave_key is None:
+                return
+            if self.autosave_worker is not None and self.autosave_worker.isRunning():
+                return
+            worker = AutosaveWorker(temp_path, snapshot + body, self.autosave_key)
+            revision = self.textedit.document().revision()
+            # Only a written snapshot counts; a failed one is tried again next cycle
+            worker.saved.connect(lambda: self.on_snapshot_written(temp_path, revision))
+            self.autosave_worker = worker
+            worker.start()
+            return
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(snapshot)
+            f.write(body)
+        self.on_snapshot_written(temp_path, self.textedit.document().revision())
+
+    def on_snapshot_written(self, path, revision):
+        self.saveState(path)
+        self.snapshot_needed = False
+        # Edits made while an encrypted snapshot was written still need one
+        if self.textedit.document().revision() == revision:
+            self.textedit.document().setModified(False)
+            self.unsaved_changes_flag = False
+
+    def set_encrypt_autosave(self, enabled):
+        if self.pending_snapshot is not None and not self.resolve_pending_snapshot():
+            self._encrypt_autosave_action.setChecked(not enabled)
+            return
+        if enabled and self.autosave_key is None and not self.init_autosave_key():
+            self._encrypt_autosave_action.setChecked(False)
+            return
+        self.encrypt_autosave = enabled
+        QSettings().setValue("Autosave/encrypt", enabled)
+        # Drop snapshots written in the other mode and write a fresh one next cycle
+        if self.autosave_worker is not None:
+            self.autosave_worker.wait()
+        self.removeSnapshots()
+        self.snapshot_needed = True
+
+    def init_autosave_key(self) -> bool:
+        """Create this session's autosave key and store it wrapped by a new passphrase."""
+        if self.pending_snapshot is not None and not self.resolve_pending_snapshot():
+            return False
+        if self.autosave_key is not None:
+            return True  # recovered along with last session's snapshot
+        passphrase = self.ask_passphrase(confirm=True, prompt=self.tr("Passphrase for encrypted autosave:"))
+        if passphrase is None:
+            self.statusbar.showMessage(self.tr("Autosave is paused until a passphrase is set"), 5000)
+            return False
+        key = os.urandom(32)
+        try:
+            with atomic_open(AUTOSAVE_KEY_FILE) as f:
+                f.write(wrap_key(key, passphrase))
+        except OSError as e:
+            logger.exception("Could not store the autosave key")
+            QMessageBox.warning(self, self.tr("Encrypt Autosave"),
+                                self.tr("Could not store the autosave key: %s\nAutosave is paused.") % e)
+            return False
+        self.autosave_key = key
+        return True
+
+    def resolve_pending_snapshot(self) -> bool:
+        """Restore or discard last session's encrypted snapshot before its key can be replaced.
+
+        Returns False if the user keeps it for later; autosave stays paused then, and
+        neither the snapshot nor its key file are touched, even on exit.
+        """
+        box = QMessageBox(QMessageBox.Icon.Warning, self.tr("Restore Session"),
+                          self.tr("The encrypted autosave from the last session has not been restored. "
+                                  "Autosave is paused until it is restored or discarded."), parent=self)
+        restore = None
+        if self.textedit.document().isEmpty():
+            restore = box.addButton(self.tr("Restore"), QMessageBox.ButtonRole.AcceptRole)
+        discard = box.addButton(self.tr("Discard It"), QMessageBox.ButtonRole.DestructiveRole)
+        box.addButton(self.tr("Keep It for Later"), QMessageBox.ButtonRole.RejectRole)
+        box.exec()
+        clicked = box.clickedButton()
+        if restore is not None and clicked is restore:
+            self.restoreSession()
+        elif clicked is discard:
+            try:
+                os.remove(self.pending_snapshot)
+            except OSError:
+                pass
+            self.pending_snapshot = None
+        if self.pending_snapshot is not None:
+            self.statusbar.showMessage(self.tr("Autosave is paused until the last session is restored"), 5000)
+            return False
+        return True
+
+    def decryptSnapshot(self, path):
+        """Ask for the autosave passphrase and return the decrypted snapshot, or None."""
+        try:
+            with open(AUTOSAVE_KEY_FILE, "rb") as f:
+                wrapped = f.read()
+        except OSError:
+            QMessageBox.warning(self, self.tr("Restore Session"),
+                                self.tr("The key for the encrypted autosave is missing; it cannot be restored."))
+            return None
+        while True:
+            passphrase = self.ask_passphrase(prompt=self.tr("Passphrase to restore the encrypted autosave:"))
+            if passphrase is None:
+                return None
+            try:
+                key = unwrap_key(wrapped, passphrase)
+                break
+            except InvalidTag:
+                QMessageBox.warning(self, self.tr("Restore Session"), self.tr("Wrong passphrase."))
+        try:
+            with open(path, "rb") as f:
+                text = "".join(decrypt_document(f, key))
+        except (InvalidTag, ValueError):
+            logger.exception("Encrypted autosave %s is damaged", path)
+            return None
+        # Keep the recovered key so this session goes on writing snapshots with it
+        self.autosave_key = key
+        return text
 
     def saveState(self, path: str):
         state = {"last_file": path}
@@ -2521,8 +4551,18 @@ class Notepad(QMainWindow):
     def restoreSession(self):
         last_file = self.loadState()
         if last_file and os.path.exists(last_file):
-            with open(last_file, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            if is_encrypted_document(last_file):
+                text = self.decryptSnapshot(last_file)
+                if text is None:
+                    # Keep it and the key it needs until it is restored or discarded
+                    if os.path.exists(AUTOSAVE_KEY_FILE):
+                        self.pending_snapshot = last_file
+                    return
+                self.pending_snapshot = None
+                lines = io.StringIO(text).readlines()
+            else:
+                with open(last_file, "r", encoding="utf-8") as f:
+                    lines = f.readlines()
 
             if lines[0].startswith("[TYPE:UNSAVED]"):
                 encoded = "".join(lines[1:]).strip()
@@ -2544,15 +4584,31 @@ class Notepad(QMainWindow):
                 self.file_path = path
                 self.unsaved_changes_flag = True
                 
-    def cleanupTemp(self):
+    def removeSnapshots(self):
         for fname in os.listdir(BUNNYPAD_TEMP):
-            if fname.endswith(".bptmp"):
+            if fname.endswith(".bptmp") and os.path.join(BUNNYPAD_TEMP, fname) != self.pending_snapshot:
                 try:
                     os.remove(os.path.join(BUNNYPAD_TEMP, fname))
                 except Exception:
                     pass
-        if os.path.exists(DIRTY_FILE):
-            os.remove(DIRTY_FILE)
+
+    def cleanupTemp(self):
+        if self.autosave_worker is not None:
+            self.autosave_worker.wait()
+        if self.pdf_worker is not None:
+            self.pdf_worker.wait()
+        if self.print_worker is not None:
+            self.print_worker.wait()
+        if self.sysinfo_collector is not None:
+            self.sysinfo_collector.wait()
+        self.update_scheduler.stop()
+        self.update_scheduler.wait()
+        self.removeSnapshots()
+        for path in (AUTOSAVE_KEY_FILE, DIRTY_FILE):
+            if path == AUTOSAVE_KEY_FILE and self.pending_snapshot is not None:
+                continue
+            if os.path.exists(path):
+                os.remove(path)
 
 
 # --------------------